@@ -1,26 +1,76 @@
 import argparse
+import logging
+import os
+import stat
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
-
-# 添加src目录到Python路径
-src_path = Path(__file__).parent / "src"
-sys.path.insert(0, str(src_path))
+from typing import Dict, List, Optional, Tuple
 
 from src.core.config import Config
+from src.core.database import TMDBCacheDB, ProcessedFilesDB, AICacheDB
 from src.core.media_organizer import MediaOrganizer
-from src.utils.helpers import setup_logging
+from src.linkers.file_linker import FileLinker
+from src.processors.ai_processor import AIProcessor
+from src.processors.tmdb_client import TMDBClient
+from src.scanners.file_scanner import FileScanner
+from src.utils.helpers import (
+    setup_logging,
+    is_video_file,
+    calculate_fingerprint,
+    calculate_quick_hash,
+    format_file_size,
+    FINGERPRINT_ALGORITHM,
+)
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
+def _movie_target(base_dir: str):
+    """电影目标路径模板：返回（基础目录, 文件夹, 季文件夹, 文件名）"""
+
+    def build(tmdb_data: Dict, ai_data: Dict, suffix: str):
+        name = f"{tmdb_data['title']} ({tmdb_data['release_year']})"
+        return base_dir, name, None, f"{name}{suffix}"
+
+    return build
+
+
+def _tv_target(base_dir: str):
+    """电视剧目标路径模板：返回（基础目录, 文件夹, 季文件夹, 文件名）"""
+
+    def build(tmdb_data: Dict, ai_data: Dict, suffix: str):
+        season = ai_data.get("season", 1)
+        episode = ai_data.get("episode", 1)
+        return (
+            base_dir,
+            f"{tmdb_data['title']} ({tmdb_data['release_year']})",
+            f"Season {season:02d}",
+            f"{tmdb_data['title']} S{season:02d}E{episode:02d}{suffix}",
+        )
+
+    return build
+
+
+# 测试模式的目标路径模板，按（媒体类型, 是否动漫）分派
+TEST_TARGET_TEMPLATES = {
+    ("movie", True): _movie_target("动漫/电影"),
+    ("movie", False): _movie_target("电影"),
+    ("tv", True): _tv_target("动漫/电视"),
+    ("tv", False): _tv_target("电视"),
+}
+
+
 class CommandLineOrganizer:
     """命令行模式整理器 - 修复测试模式和动漫判断"""
 
-    def __init__(self, config: Config, test_mode: bool = False):
+    def __init__(
+        self, config: Config, test_mode: bool = False, workers: Optional[int] = None
+    ):
         self.config = config
         self.test_mode = test_mode
+        self.workers = workers or config.scan_workers
         self.logger = logger
 
         # 初始化组件
@@ -29,16 +79,14 @@ class CommandLineOrganizer:
     def _init_components(self):
         """初始化组件"""
         try:
-            from src.core.database import TMDBCacheDB, ProcessedFilesDB
-            from src.processors.ai_processor import AIProcessor
-            from src.processors.tmdb_client import TMDBClient
-            from src.linkers.file_linker import FileLinker
-
             self.tmdb_cache_db = TMDBCacheDB(
                 self.config.tmdb_cache_db, self.config.cache_expire_days
             )
             self.processed_files_db = ProcessedFilesDB(self.config.processed_files_db)
-            self.ai_processor = AIProcessor(self.config)
+            self.ai_cache_db = AICacheDB(
+                self.config.ai_cache_db, self.config.cache_expire_days
+            )
+            self.ai_processor = AIProcessor(self.config, self.ai_cache_db)
             self.tmdb_client = TMDBClient(
                 self.config.tmdb_api_key, self.tmdb_cache_db, self.config.tmdb_proxy
             )
@@ -55,38 +103,92 @@ class CommandLineOrganizer:
             self.logger.error(f"初始化组件失败: {e}")
             raise
 
-    def organize_single_file(self, file_path: Path) -> bool:
-        """整理单个文件"""
-        try:
-            self.logger.info(f"处理文件: {file_path}")
+    def close(self) -> None:
+        """关闭数据库（缓存数据库关闭前会写回访问时间）"""
+        for db in (self.tmdb_cache_db, self.processed_files_db, self.ai_cache_db):
+            try:
+                db.close()
+            except Exception as e:
+                self.logger.warning(f"关闭数据库失败: {e}")
 
-            # 基本检查
-            if not file_path.exists() or not file_path.is_file():
+    def organize_single_file(
+        self, file_path: Path, stat_result: Optional[os.stat_result] = None
+    ) -> bool:
+        """整理单个文件，stat_result 为扫描时已获取的文件信息"""
+        try:
+            # 路径字符串只计算一次，后续的 stat、数据库查询和日志都复用
+            file_path_str = os.fspath(file_path)
+
+            # 逐文件日志使用延迟格式化，日志级别关闭时不产生格式化开销
+            self.logger.info("处理文件: %s", file_path_str)
+
+            # 基本检查（一次 stat 同时判断存在性和文件类型）
+            if stat_result is None:
+                try:
+                    stat_result = os.stat(file_path_str)
+                except OSError:
+                    pass
+            if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
                 self.logger.error(f"文件无效: {file_path}")
                 return False
 
-            from src.utils.helpers import is_video_file, calculate_md5, format_file_size
-
             if not is_video_file(file_path):
                 self.logger.error(f"不是视频文件: {file_path}")
                 return False
 
-            file_size = file_path.stat().st_size
+            file_size = stat_result.st_size
             if file_size < self.config.ignore_file_size:
                 self.logger.warning(f"文件太小: {file_path}")
                 return False
 
-            # 检查是否已处理
-            md5_hash = calculate_md5(file_path) if self.config.use_md5 else None
-            if not self.test_mode and self.processed_files_db.is_processed(
-                str(file_path), md5_hash, self.config.use_md5
-            ):
-                self.logger.info(f"文件已处理: {file_path}")
-                return True
+            # 检查是否已处理：先比较元数据，不一致时再按内容与已处理记录比较
+            quick_hash = None
+            fingerprint = None
+            if not self.test_mode:
+                if self._skip_by_metadata() and (
+                    self.processed_files_db.is_processed_by_metadata(
+                        file_path_str, *ProcessedFilesDB.metadata_key(stat_result)
+                    )
+                ):
+                    self.logger.info("文件已处理: %s", file_path_str)
+                    return True
+
+                if self.config.use_md5:
+                    # 快速指纹相同时才读取整个文件，按完整指纹确认内容相同
+                    quick_hash = calculate_quick_hash(file_path)
+                    duplicate = None
+                    if quick_hash:
+                        duplicate, fingerprint = self.processed_files_db.find_duplicate(
+                            file_path_str, file_size, quick_hash, self._fingerprint_of
+                        )
+                    else:
+                        fingerprint = self._fingerprint_of(file_path_str)
+                        if fingerprint:
+                            duplicate = self.processed_files_db.find_fingerprint(
+                                file_size, fingerprint
+                            )
+                    if duplicate:
+                        if duplicate == file_path_str:
+                            # 内容未变化（如只修改了时间），更新记录的元数据，下次直接跳过
+                            self.processed_files_db.refresh_file_identity(
+                                file_path_str,
+                                stat_result.st_mtime_ns,
+                                stat_result.st_dev,
+                                stat_result.st_ino,
+                                quick_hash,
+                            )
+                        self.logger.info(
+                            "文件已处理: %s（相同内容: %s）", file_path_str, duplicate
+                        )
+                        return True
+                elif self.processed_files_db.is_processed(file_path_str, use_md5=False):
+                    self.logger.info("文件已处理: %s", file_path_str)
+                    return True
 
             # 处理文件
-            if self._process_file(file_path, file_size, md5_hash):
-                self.logger.info(f"文件处理完成: {file_path}")
+            # 与已处理记录的快速指纹相同时已计算完整指纹，一并保存；否则只保存快速指纹
+            if self._process_file(file_path, stat_result, fingerprint, quick_hash):
+                self.logger.info("文件处理完成: %s", file_path_str)
                 return True
             else:
                 self.logger.error(f"文件处理失败: {file_path}")
@@ -96,14 +198,37 @@ class CommandLineOrganizer:
             self.logger.error(f"处理文件失败 {file_path}: {e}")
             return False
 
+    def _skip_by_metadata(self) -> bool:
+        """与监控模式一致：启用内容检查且不要求严格比较时，元数据未变化的文件直接跳过"""
+        return self.config.use_md5 and not self.config.strict_content_check
+
+    def _fingerprint_of(
+        self, file_path_str: str, algorithm: str = FINGERPRINT_ALGORITHM
+    ) -> Optional[str]:
+        """按配置的分块大小计算文件完整指纹，失败时返回 None"""
+        return calculate_fingerprint(
+            Path(file_path_str),
+            chunk_size=self.config.hash_chunk_size,
+            parallel_threshold=self.config.parallel_hash_threshold,
+            algorithm=algorithm,
+        )
+
     def _process_file(
-        self, file_path: Path, file_size: int, md5_hash: Optional[str]
+        self,
+        file_path: Path,
+        stat_result: os.stat_result,
+        fingerprint: Optional[str],
+        quick_hash: Optional[str] = None,
     ) -> bool:
         """处理文件核心逻辑"""
+        file_size = stat_result.st_size
+        file_path_str = os.fspath(file_path)
+        file_name = file_path.name
+
         # AI提取信息
-        ai_data = self.ai_processor.extract_media_info(file_path.name)
+        ai_data = self.ai_processor.extract_media_info(file_name)
         if not ai_data:
-            self.logger.error(f"AI解析失败: {file_path.name}")
+            self.logger.error(f"AI解析失败: {file_name}")
             return False
 
         # TMDB查询
@@ -121,7 +246,11 @@ class CommandLineOrganizer:
         # 判断是否为动漫（使用分类ID判断）
         is_anime = tmdb_data.get("is_anime", False)
         self.logger.info(
-            f"媒体信息: {tmdb_data['title']} ({tmdb_data['release_year']}) - 类型: {tmdb_data['media_type']} - 动漫: {is_anime}"
+            "媒体信息: %s (%s) - 类型: %s - 动漫: %s",
+            tmdb_data["title"],
+            tmdb_data["release_year"],
+            tmdb_data["media_type"],
+            is_anime,
         )
 
         # 测试模式：只显示信息，不实际处理
@@ -130,7 +259,7 @@ class CommandLineOrganizer:
             return True
 
         # 正常模式：创建链接
-        file_info = {"file_path": str(file_path), "file_size": file_size}
+        file_info = {"file_path": file_path_str, "file_size": file_size}
         target_path = self.file_linker.organize_file(file_info, tmdb_data, ai_data)
 
         if not target_path:
@@ -140,13 +269,17 @@ class CommandLineOrganizer:
         # 记录到数据库
         if not self.test_mode:
             self.processed_files_db.add_processed_file(
-                str(file_path),
+                file_path_str,
                 file_size,
-                md5_hash,
+                fingerprint,
                 tmdb_id=tmdb_data["tmdb_id"],
                 media_type=tmdb_data["media_type"],
                 target_path=str(target_path),
                 use_md5=self.config.use_md5,
+                mtime_ns=stat_result.st_mtime_ns,
+                quick_hash=quick_hash,
+                file_dev=stat_result.st_dev,
+                file_ino=stat_result.st_ino,
             )
 
         return True
@@ -155,6 +288,10 @@ class CommandLineOrganizer:
         self, file_path: Path, tmdb_data: Dict, ai_data: Dict, is_anime: bool
     ):
         """显示测试模式信息"""
+        # 仅用于展示，INFO 级别关闭时跳过字典格式化和路径拼接
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
         self.logger.info("=" * 50)
         self.logger.info("测试模式 - 文件处理信息:")
         self.logger.info(f"源文件: {file_path}")
@@ -168,27 +305,18 @@ class CommandLineOrganizer:
         self.logger.info(f"分类ID: {tmdb_data.get('genre_ids', [])}")
         self.logger.info(f"是否为动漫: {is_anime} (通过分类ID 16 判断)")
 
-        # 显示目标路径信息
-        if tmdb_data["media_type"] == "movie":
-            base_dir = "动漫/电影" if is_anime else "电影"
-            folder_name = f"{tmdb_data['title']} ({tmdb_data['release_year']})"
-            file_name = (
-                f"{tmdb_data['title']} ({tmdb_data['release_year']}){file_path.suffix}"
-            )
-        else:
-            base_dir = "动漫/电视" if is_anime else "电视"
-            folder_name = f"{tmdb_data['title']} ({tmdb_data['release_year']})"
-            season = ai_data.get("season", 1)
-            season_folder = f"Season {season:02d}"
-            episode = ai_data.get("episode", 1)
-            file_name = (
-                f"{tmdb_data['title']} S{season:02d}E{episode:02d}{file_path.suffix}"
-            )
+        # 显示目标路径信息（按媒体类型和是否动漫选择预定义的模板）
+        media_type = "movie" if tmdb_data["media_type"] == "movie" else "tv"
+        build_target = TEST_TARGET_TEMPLATES[(media_type, bool(is_anime))]
+        base_dir, folder_name, season_folder, file_name = build_target(
+            tmdb_data, ai_data, file_path.suffix
+        )
 
-        target_path = Path(self.config.library_path) / base_dir / folder_name
-        if tmdb_data["media_type"] == "tv":
-            target_path = target_path / season_folder
-        target_path = target_path / file_name
+        # 仅用于显示，直接拼接字符串而不构造多个 Path 对象
+        parts = [self.config.library_path, base_dir, folder_name]
+        if season_folder:
+            parts.append(season_folder)
+        target_path = os.path.join(*parts, file_name)
 
         self.logger.info(f"目标路径: {target_path}")
         self.logger.info("测试模式完成 - 文件未被移动")
@@ -197,20 +325,36 @@ class CommandLineOrganizer:
     def organize_directory(self, directory: Path) -> bool:
         """整理目录中的所有文件"""
         try:
-            from src.scanners.file_scanner import FileScanner
-
             self.logger.info(f"开始扫描目录: {directory}")
             scanner = FileScanner(self.processed_files_db, self.config)
 
-            success_count = 0
-            total_count = 0
+            # AI服务并发受信号量限制，超出的请求会被直接跳过
+            max_workers = min(self.workers, self.config.ai_max_concurrent)
+            if max_workers < self.workers:
+                self.logger.warning(f"并发线程数受AI并发限制，调整为: {max_workers}")
 
-            for file_path, file_size in scanner.scan_directory(
-                directory, check_size=True
-            ):
-                total_count += 1
-                if self.organize_single_file(file_path):
-                    success_count += 1
+            # 阶段1：一次性收集所有候选文件（连同扫描时的 stat 信息）
+            files = scanner.collect_paths(
+                directory, check_size=True, max_workers=self.workers
+            )
+            total_count = len(files)
+
+            # 批量查询已处理记录，跳过未变化的文件
+            if not self.test_mode:
+                files = self._skip_processed_files(files)
+            success_count = total_count - len(files)
+
+            # 阶段2：并发处理所有文件
+            with ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="Organizer"
+            ) as executor:
+                success_count += sum(
+                    1
+                    for result in executor.map(
+                        lambda item: self.organize_single_file(*item), files
+                    )
+                    if result
+                )
 
             self.logger.info(f"目录处理完成: {success_count}/{total_count} 成功")
             return success_count == total_count
@@ -219,6 +363,33 @@ class CommandLineOrganizer:
             self.logger.error(f"处理目录失败 {directory}: {e}")
             return False
 
+    def _skip_processed_files(
+        self, files: List[Tuple[Path, os.stat_result]]
+    ) -> List[Tuple[Path, os.stat_result]]:
+        """一次批量查询已处理记录，过滤掉路径和元数据（与单文件检查相同的键）均未变化的文件"""
+        if self.config.use_md5 and not self._skip_by_metadata():
+            return files
+
+        processed = self.processed_files_db.get_processed_metadata(
+            [str(file_path) for file_path, _ in files]
+        )
+        if not processed:
+            return files
+
+        remaining = []
+        for file_path, stat_result in files:
+            record = processed.get(str(file_path))
+            if record is not None:
+                # 不检查MD5时与 is_processed 一致，仅按路径判断
+                if not self.config.use_md5:
+                    continue
+                if record == ProcessedFilesDB.metadata_key(stat_result):
+                    continue
+            remaining.append((file_path, stat_result))
+
+        self.logger.info(f"跳过 {len(files) - len(remaining)} 个已处理文件")
+        return remaining
+
 
 def main():
     """命令行模式主函数"""
@@ -252,9 +423,13 @@ def main():
     parser.add_argument(
         "--test", action="store_true", help="测试模式（不实际移动文件）"
     )
+    parser.add_argument(
+        "--workers", type=int, help="整理目录时的并发线程数（默认读取配置）"
+    )
 
     args = parser.parse_args()
 
+    organizer = None
     try:
         # 加载配置
         config = Config(args.config)
@@ -264,7 +439,9 @@ def main():
         setup_logging(log_level)
 
         # 创建整理器
-        organizer = CommandLineOrganizer(config, test_mode=args.test)
+        organizer = CommandLineOrganizer(
+            config, test_mode=args.test, workers=args.workers
+        )
 
         success_count = 0
         total_count = 0
@@ -300,6 +477,9 @@ def main():
     except Exception as e:
         logger.error(f"程序运行错误: {e}")
         sys.exit(1)
+    finally:
+        if organizer is not None:
+            organizer.close()
 
 
 if __name__ == "__main__":
@@ -1,10 +1,5 @@
 import logging
 import sys
-from pathlib import Path
-
-# 添加src目录到Python路径
-src_path = Path(__file__).parent / "src"
-sys.path.insert(0, str(src_path))
 
 # 设置基本日志配置
 logging.basicConfig(
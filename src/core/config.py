@@ -1,13 +1,173 @@
 import configparser
+import copy
+import fnmatch
+import hashlib
 import os
+import re
+import signal
+from functools import lru_cache, wraps
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple
 import logging
 import time
 import threading
 
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # 未安装watchdog时回退到轮询
+    Observer = None
+    FileSystemEventHandler = object
+
 logger = logging.getLogger(__name__)
 
+# 布尔配置项视为真的取值
+_TRUE_VALUES = frozenset(("true", "yes", "1", "on"))
+
+# 需要脱敏的配置项名称
+SENSITIVE_KEY_PATTERN = re.compile(r"key|password|token|secret|auth", re.IGNORECASE)
+
+
+@lru_cache(maxsize=256)
+def _split_items(raw: str) -> Tuple[str, ...]:
+    """按逗号拆分配置字符串，相同原始值只解析一次"""
+    return tuple(item.strip() for item in raw.split(",") if item.strip())
+
+
+@lru_cache(maxsize=256)
+def _split_paths(raw: str) -> Tuple[Path, ...]:
+    """按逗号拆分路径配置，相同原始值只解析一次"""
+    return tuple(Path(item) for item in _split_items(raw))
+
+
+def _at_least_one(value: int) -> int:
+    """线程数等配置至少为1"""
+    return max(1, value)
+
+
+def _mb_to_bytes(mb_size: int) -> int:
+    """MB转换为字节"""
+    return mb_size * 1024 * 1024
+
+
+def _compile_globs(patterns: Tuple[str, ...]) -> re.Pattern:
+    """把通配符模式合并为一个忽略大小写的正则，没有模式时永不匹配"""
+    if not patterns:
+        return re.compile(r"(?!)")
+    return re.compile(
+        "|".join(fnmatch.translate(pattern) for pattern in patterns), re.IGNORECASE
+    )
+
+
+def _option(section: str, key: str, default: Any, kind: str = "", convert=None):
+    """根据配置项定义生成只读属性
+
+    kind 为空时按默认值类型选择解析方法（str/int/float/bool），
+    也可指定 path、path_list、str_list；convert 对解析结果做二次处理。
+    """
+    getter_name = f"_get_{kind or type(default).__name__}"
+    # 与 _cached_value 生成的键一致，已解析的值直接从快照字典读取
+    cache_key = ("_get_option", getter_name, section, key, default, convert)
+
+    def fget(self):
+        try:
+            return self._cache[cache_key]
+        except KeyError:
+            return self._get_option(getter_name, section, key, default, convert)
+
+    return property(fget, doc=f"{section}.{key}")
+
+
+# 默认配置文件内容，注释以 # 开头单独成行
+_DEFAULT_INI = """\
+[PATHS]
+# 要监控的目录，多个目录用逗号分隔
+monitor_directories = /path/to/movies,/path/to/tv_shows
+# 媒体库根目录
+library_path = /path/to/media_library
+# 动漫目录名称
+anime_directory = 动漫
+
+[AI]
+# AI服务类型: deepseek, spark, model_scope, zhipu
+ai_type = deepseek
+# AI并发请求限制
+ai_max_concurrent = 5
+# AI输出token限制（默认200，足够完成媒体信息提取）
+ai_max_tokens = 200
+# DeepSeek API配置
+deepseek_api_key = your_deepseek_api_key
+deepseek_url = https://api.deepseek.com/v1/chat/completions
+# 讯飞星火认知大模型配置
+spark_api_key = your_spark_api_key
+spark_url = https://spark-api-open.xf-yun.com/v1/chat/completions
+spark_model = Lite
+# 魔塔API-Inference配置
+model_scope_api_key = your_model_scope_api_key
+model_scope_url = https://api-inference.modelscope.cn/v1/chat/completions
+model_scope_model = Qwen3-235B-A22B-Instruct-2507
+# 智普AI配置
+zhipu_api_key = your_zhipu_api_key
+zhipu_url = https://open.bigmodel.cn/api/paas/v4/chat/completions
+zhipu_model = GLM-4.5-Flash
+
+[TMDB]
+# TMDB API配置
+tmdb_api_key = your_tmdb_api_key
+# TMDB请求代理（可选）
+tmdb_proxy =
+
+[DATABASE]
+# 数据库文件路径
+tmdb_cache_db = tmdb_cache.db
+processed_files_db = processed_files.db
+ai_cache_db = ai_cache.db
+
+[SYSTEM]
+# 工作线程数
+worker_threads = 5
+# 稳定性检查线程数
+stability_worker_threads = 2
+# MD5计算线程数
+md5_worker_threads = 2
+# 命令行目录整理并发线程数
+scan_workers = 4
+# 日志级别: DEBUG, INFO, WARNING, ERROR
+log_level = INFO
+# 初始扫描模式 (true/false)
+initial_scan = true
+# 监控文件事件类型: created, moved
+watch_events = created,moved
+# 文件稳定延迟（秒）
+file_stable_delay = 5
+# 忽略的文件模式
+ignore_patterns = *.tmp,*.part,*.crdownload,*.swp
+# 文件稳定检查最大等待时间（秒）
+max_file_wait_time = 300
+# 忽略的文件大小（MB）
+ignore_file_size = 10
+# 文件访问重试间隔（秒）
+file_retry_interval = 5
+# 最大待处理文件数
+max_pending_files = 10000
+# 性能监控间隔（秒）
+performance_monitor_interval = 60
+# MD5检查开关 (true/false)
+use_md5 = true
+# 计算MD5时每次读取的块大小（MB）
+hash_chunk_size = 1
+# 超过该大小（MB）的文件使用多线程计算指纹
+parallel_hash_threshold = 1024
+# 严格内容检查：忽略大小/修改时间/inode快速判断，始终计算指纹 (true/false)
+strict_content_check = false
+# 文件链接方法: hardlink, symlink, copy
+link_method = hardlink
+# 配置自动重载 (true/false)
+auto_reload = true
+# 文件事件不可用时的配置轮询间隔（秒），0 表示不轮询，改用 SIGHUP 重载
+config_poll_interval = 0
+"""
+
 
 class ConfigValidationError(Exception):
     """配置验证错误"""
@@ -15,6 +175,49 @@ class ConfigValidationError(Exception):
     pass
 
 
+def _cached_value(func):
+    """缓存解析后的配置值，重新加载配置时整体替换（解析在锁内进行）"""
+
+    @wraps(func)
+    def wrapper(self, *args):
+        cache_key = (func.__name__,) + args
+        try:
+            return self._cache[cache_key]
+        except KeyError:
+            pass
+
+        with self._lock:
+            if cache_key not in self._cache:
+                self._cache[cache_key] = func(self, *args)
+            return self._cache[cache_key]
+
+    return wrapper
+
+
+class ConfigFileHandler(FileSystemEventHandler):
+    """配置文件事件处理器"""
+
+    def __init__(self, config_file: str, callback):
+        # 需传入绝对路径，与事件中的路径直接比较
+        self.config_file = config_file
+        self.callback = callback
+
+    def on_modified(self, event):
+        """处理文件修改事件"""
+        if not event.is_directory and event.src_path == self.config_file:
+            self.callback()
+
+    def on_created(self, event):
+        """处理文件创建事件"""
+        if not event.is_directory and event.src_path == self.config_file:
+            self.callback()
+
+    def on_moved(self, event):
+        """处理文件移动事件（编辑器原子替换保存）"""
+        if not event.is_directory and event.dest_path == self.config_file:
+            self.callback()
+
+
 class Config:
     """配置管理类 - 支持热重载"""
 
@@ -22,225 +225,282 @@ class Config:
         self, config_file: str = "config.ini", enable_auto_reload: bool = True
     ):
         self.config_file = config_file
-        self.config = configparser.ConfigParser()
-        self._validation_errors: List[str] = []
-        self._last_mtime = 0
+        # 绝对路径只解析一次，stat/读取/目录监控都复用同一个对象
+        self._config_path = Path(config_file).absolute()
+        self.config = configparser.ConfigParser(interpolation=None)
+        # 当前配置快照的无效项警告，使用集合去重，重新加载时清空
+        self._validation_errors: Set[str] = set()
+        self._last_mtime_ns = 0
+        self._last_hash = b""
         self._lock = threading.RLock()
         self._enable_auto_reload = enable_auto_reload
-
-        # 初始加载配置
+        self._reload_observer = None
+        # 配置重载成功后依次调用的回调，用于更新运行中组件的动态配置
+        self._reload_callbacks: List[Callable[[], None]] = []
+        # 解析后的配置值缓存，load_config 时清空
+        self._cache: Dict[tuple, Any] = {}
+        # 上次验证通过的媒体库目录，重载时未变化则跳过文件系统检查
+        self._validated_library_path: Optional[Path] = None
+
+        # 初始加载配置（包含验证）
         self.load_config()
-        self.validate_config()
 
         # 启动自动重载线程
         if self._enable_auto_reload and self.auto_reload:
             self._start_auto_reload()
 
     def _start_auto_reload(self):
-        """启动自动重载线程"""
+        """启动自动重载监控 - 优先使用文件系统事件，不可用时依赖 SIGHUP"""
+        # 无论是否有文件事件，都支持 kill -HUP <pid> 手动触发重载
+        self._install_sighup_handler()
+
+        if Observer is not None:
+            try:
+                # 监控所在目录，以便捕获编辑器的原子替换（写临时文件后重命名）
+                observer = Observer()
+                observer.daemon = True
+                observer.schedule(
+                    ConfigFileHandler(
+                        str(self._config_path), self._on_config_file_changed
+                    ),
+                    str(self._config_path.parent),
+                    recursive=False,
+                )
+                observer.start()
+                self._reload_observer = observer
+                logger.info("配置自动重载监控已启动（文件事件）")
+                return
+            except Exception as e:
+                logger.warning(f"文件事件监控启动失败: {e}")
+
+        # 轮询仅作为显式开启的兜底（Windows、NFS/FUSE 等文件事件不可靠的场景）
+        poll_interval = self.config_poll_interval
+        if poll_interval > 0:
+            self._start_polling_reload(poll_interval)
+        elif hasattr(signal, "SIGHUP"):
+            logger.info("文件事件监控不可用，可发送 SIGHUP 信号重新加载配置")
+        else:
+            logger.warning(
+                "文件事件监控不可用，如需自动重载请设置 config_poll_interval"
+            )
+
+    def _install_sighup_handler(self) -> None:
+        """注册 SIGHUP 信号处理，收到信号时重新加载配置"""
+        if not hasattr(signal, "SIGHUP"):
+            return
+
+        def sighup_handler(signum, frame):
+            # 信号处理函数在主线程中断执行，主线程可能正持有配置锁，
+            # 因此放到临时线程中重载，避免在 load_config 中途重入
+            threading.Thread(
+                target=self.reload_config, daemon=True, name="ConfigReload"
+            ).start()
+
+        try:
+            signal.signal(signal.SIGHUP, sighup_handler)
+        except ValueError:
+            # 只能在主线程中注册信号处理函数
+            logger.debug("非主线程创建配置，跳过 SIGHUP 重载注册")
+
+    def _on_config_file_changed(self):
+        """配置文件变化回调"""
+        # 一次保存可能触发多个事件，通过修改时间去重
+        if self._should_reload():
+            logger.info("检测到配置文件变化，重新加载配置...")
+            self._reload_snapshot()
+
+    def _start_polling_reload(self, interval: int):
+        """启动轮询重载线程（需在配置中显式开启）"""
 
         def reload_monitor():
             while True:
-                try:
-                    time.sleep(10)
-                    if self._should_reload():
-                        logger.info("检测到配置文件变化，重新加载配置...")
-                        self.load_config()
-                        self.validate_config()
-                except Exception as e:
-                    logger.error(f"配置重载监控错误: {e}")
-                    time.sleep(30)
+                time.sleep(interval)
+                if self._should_reload():
+                    logger.info("检测到配置文件变化，重新加载配置...")
+                    self._reload_snapshot()
 
         reload_thread = threading.Thread(
             target=reload_monitor, daemon=True, name="ConfigReloadMonitor"
         )
         reload_thread.start()
-        logger.info("配置自动重载监控已启动")
+        logger.info(f"配置自动重载监控已启动（轮询，间隔 {interval} 秒）")
 
     def _should_reload(self) -> bool:
         """检查是否需要重新加载配置"""
         try:
-            if not os.path.exists(self.config_file):
-                return False
-
-            current_mtime = os.path.getmtime(self.config_file)
-            if current_mtime > self._last_mtime:
-                self._last_mtime = current_mtime
-                return True
+            # 单次 stat；纳秒精度避免同一秒内两次写入被漏掉
+            current_mtime_ns = self._config_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return False
         except Exception as e:
             logger.error(f"检查配置文件修改时间失败: {e}")
+            return False
 
-        return False
+        if current_mtime_ns == self._last_mtime_ns:
+            return False
+
+        self._last_mtime_ns = current_mtime_ns
+        try:
+            # 仅修改时间变化（touch、保存未改动的文件）时不重新加载
+            with self._config_path.open("rb") as f:
+                return self._hash_content(f.read()) != self._last_hash
+        except Exception as e:
+            logger.error(f"读取配置文件失败: {e}")
+            return False
+
+    def _read_config_file(self) -> bytes:
+        """读取配置文件内容，同时通过已打开的文件记录修改时间"""
+        with self._config_path.open("rb") as f:
+            self._last_mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+            return f.read()
 
     def load_config(self) -> None:
-        """加载配置文件"""
+        """加载并验证配置文件，验证通过后才替换当前配置"""
         with self._lock:
-            if not os.path.exists(self.config_file):
-                logger.warning(f"配置文件不存在，创建默认配置: {self.config_file}")
-                self.create_default_config()
-
             try:
-                self._last_mtime = os.path.getmtime(self.config_file)
-                self.config.read(self.config_file, encoding="utf-8")
-                logger.info(f"成功加载配置文件: {self.config_file}")
+                try:
+                    content = self._read_config_file()
+                except FileNotFoundError:
+                    logger.warning(f"配置文件不存在，创建默认配置: {self.config_file}")
+                    self.create_default_config()
+                    content = self._read_config_file()
+
+                # 配置中不使用插值，关闭后取值无需展开，且值中的 % 不会报错
+                parser = configparser.ConfigParser(interpolation=None)
+                parser.read_string(content.decode("utf-8"), source=self.config_file)
             except Exception as e:
                 logger.error(f"加载配置文件失败: {e}")
                 raise ConfigValidationError(f"无法加载配置文件: {e}")
 
-    def reload_config(self) -> bool:
-        """手动重新加载配置"""
+            # 在副本上解析和验证，失败时当前配置保持不变
+            snapshot = copy.copy(self)
+            snapshot.config = parser
+            snapshot._cache = {}
+            snapshot._validation_errors = set()
+            snapshot._warm_cache()
+            snapshot.validate_config()
+
+            # 验证通过后整体替换，读取方不会看到部分更新或未验证的配置
+            self._cache = snapshot._cache
+            self.config = parser
+            self._validation_errors = snapshot._validation_errors
+            self._validated_library_path = snapshot._validated_library_path
+            self._last_hash = self._hash_content(content)
+            logger.info(f"成功加载配置文件: {self.config_file}")
+
+    @staticmethod
+    def _hash_content(content: bytes) -> bytes:
+        """计算配置文件内容的哈希"""
+        return hashlib.blake2b(content, digest_size=16).digest()
+
+    def _warm_cache(self) -> None:
+        """预先解析所有配置属性，之后的属性读取都是无锁的字典查找"""
+        for name, attr in vars(Config).items():
+            if isinstance(attr, property):
+                try:
+                    getattr(self, name)
+                except Exception:
+                    pass
+
+    def _reload_snapshot(self) -> bool:
+        """重新加载并验证配置，失败时继续使用上一次的有效配置"""
         try:
             self.load_config()
-            self.validate_config()
-            logger.info("手动重载配置成功")
-            return True
         except Exception as e:
-            logger.error(f"手动重载配置失败: {e}")
+            # 编辑器写入到一半等情况下保持原配置继续运行，等待下一次文件变化
+            logger.error(f"配置重载失败，继续使用上一次的有效配置: {e}")
             return False
 
+        for callback in list(self._reload_callbacks):
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"配置重载回调执行失败: {e}")
+        return True
+
+    def add_reload_callback(self, callback: Callable[[], None]) -> None:
+        """注册配置重载成功后的回调（文件事件、轮询、SIGHUP 触发的重载都会调用）"""
+        self._reload_callbacks.append(callback)
+
+    def reload_config(self) -> bool:
+        """手动重新加载配置"""
+        if self._reload_snapshot():
+            logger.info("手动重载配置成功")
+            return True
+        return False
+
     def create_default_config(self) -> None:
         """创建默认配置文件"""
-        config_sections = {
-            "PATHS": {
-                "# 要监控的目录，多个目录用逗号分隔": "",
-                "monitor_directories": "/path/to/movies,/path/to/tv_shows",
-                "# 媒体库根目录": "",
-                "library_path": "/path/to/media_library",
-                "# 动漫目录名称": "",
-                "anime_directory": "动漫",
-            },
-            "AI": {
-                "# AI服务类型: deepseek, spark, model_scope, zhipu": "",
-                "ai_type": "deepseek",
-                "# AI并发请求限制": "",
-                "ai_max_concurrent": "5",
-                "# AI输出token限制（默认200，足够完成媒体信息提取）": "",
-                "ai_max_tokens": "200",
-                "# DeepSeek API配置": "",
-                "deepseek_api_key": "your_deepseek_api_key",
-                "deepseek_url": "https://api.deepseek.com/v1/chat/completions",
-                "# 讯飞星火认知大模型配置": "",
-                "spark_api_key": "your_spark_api_key",
-                "spark_url": "https://spark-api-open.xf-yun.com/v1/chat/completions",
-                "spark_model": "Lite",
-                "# 魔塔API-Inference配置": "",
-                "model_scope_api_key": "your_model_scope_api_key",
-                "model_scope_url": "https://api-inference.modelscope.cn/v1/chat/completions",
-                "model_scope_model": "Qwen3-235B-A22B-Instruct-2507",
-                "# 智普AI配置": "",
-                "zhipu_api_key": "your_zhipu_api_key",
-                "zhipu_url": "https://open.bigmodel.cn/api/paas/v4/chat/completions",
-                "zhipu_model": "GLM-4.5-Flash",
-            },
-            "TMDB": {
-                "# TMDB API配置": "",
-                "tmdb_api_key": "your_tmdb_api_key",
-                "# TMDB请求代理（可选）": "",
-                "tmdb_proxy": "",
-            },
-            "DATABASE": {
-                "# 数据库文件路径": "",
-                "tmdb_cache_db": "tmdb_cache.db",
-                "processed_files_db": "processed_files.db",
-            },
-            "SYSTEM": {
-                "# 工作线程数": "",
-                "worker_threads": "5",
-                "# 稳定性检查线程数": "",
-                "stability_worker_threads": "2",
-                "# MD5计算线程数": "",
-                "md5_worker_threads": "2",
-                "# 日志级别: DEBUG, INFO, WARNING, ERROR": "",
-                "log_level": "INFO",
-                "# 初始扫描模式 (true/false)": "",
-                "initial_scan": "true",
-                "# 监控文件事件类型: created, moved": "",
-                "watch_events": "created,moved",
-                "# 文件稳定延迟（秒）": "",
-                "file_stable_delay": "5",
-                "# 忽略的文件模式": "",
-                "ignore_patterns": "*.tmp,*.part,*.crdownload,*.swp",
-                "# 文件稳定检查最大等待时间（秒）": "",
-                "max_file_wait_time": "300",
-                "# 忽略的文件大小（MB）": "",
-                "ignore_file_size": "10",
-                "# 文件访问重试间隔（秒）": "",
-                "file_retry_interval": "5",
-                "# 最大待处理文件数": "",
-                "max_pending_files": "10000",
-                "# 性能监控间隔（秒）": "",
-                "performance_monitor_interval": "60",
-                "# MD5检查开关 (true/false)": "",
-                "use_md5": "true",
-                "# 文件链接方法: hardlink, symlink, copy": "",
-                "link_method": "hardlink",
-                "# 配置自动重载 (true/false)": "",
-                "auto_reload": "true",
-            },
-        }
-
-        for section, options in config_sections.items():
-            self.config[section] = options
-
         try:
-            with open(self.config_file, "w", encoding="utf-8") as f:
-                self.config.write(f)
+            self._config_path.write_text(_DEFAULT_INI, encoding="utf-8")
             logger.info(f"已创建默认配置文件: {self.config_file}")
         except Exception as e:
             logger.error(f"创建默认配置文件失败: {e}")
             raise
 
-    def _get_path_list(self, key: str, default: str) -> List[Path]:
+    def _add_validation_warning(self, section: str, key: str, default: Any) -> None:
+        """记录无效配置项，同一配置项只记录一次"""
+        self._validation_errors.add(
+            f"配置项 {section}.{key} 值无效，使用默认值: {default}"
+        )
+
+    @_cached_value
+    def _get_option(self, getter_name, section, key, default, convert):
+        """按配置项定义读取并转换，结果随配置快照缓存"""
+        value = getattr(self, getter_name)(section, key, default)
+        return value if convert is None else convert(value)
+
+    @_cached_value
+    def _get_str(self, section: str, key: str, default: str) -> str:
+        """获取字符串值"""
+        return self.config[section].get(key, default)
+
+    @_cached_value
+    def _get_path(self, section: str, key: str, default: str) -> Path:
+        """获取路径"""
+        return Path(self.config[section].get(key, default))
+
+    @_cached_value
+    def _get_path_list(self, section: str, key: str, default: str) -> Tuple[Path, ...]:
         """获取路径列表"""
-        with self._lock:
-            dirs = self.config["PATHS"].get(key, default).split(",")
-            return [Path(d.strip()) for d in dirs if d.strip()]
+        return _split_paths(self.config[section].get(key, default))
 
+    @_cached_value
     def _get_int(self, section: str, key: str, default: int) -> int:
         """获取整数值"""
-        with self._lock:
-            try:
-                return int(self.config[section].get(key, str(default)))
-            except (ValueError, KeyError):
-                self._validation_errors.append(
-                    f"配置项 {section}.{key} 值无效，使用默认值: {default}"
-                )
-                return default
+        try:
+            return int(self.config[section].get(key, str(default)))
+        except (ValueError, KeyError):
+            self._add_validation_warning(section, key, default)
+            return default
 
+    @_cached_value
     def _get_float(self, section: str, key: str, default: float) -> float:
         """获取浮点数值"""
-        with self._lock:
-            try:
-                return float(self.config[section].get(key, str(default)))
-            except (ValueError, KeyError):
-                self._validation_errors.append(
-                    f"配置项 {section}.{key} 值无效，使用默认值: {default}"
-                )
-                return default
+        try:
+            return float(self.config[section].get(key, str(default)))
+        except (ValueError, KeyError):
+            self._add_validation_warning(section, key, default)
+            return default
 
+    @_cached_value
     def _get_bool(self, section: str, key: str, default: bool) -> bool:
         """获取布尔值"""
-        with self._lock:
-            try:
-                value = self.config[section].get(key, str(default)).lower()
-                return value in ("true", "yes", "1", "on")
-            except KeyError:
-                self._validation_errors.append(
-                    f"配置项 {section}.{key} 值无效，使用默认值: {default}"
-                )
-                return default
-
-    def _get_str_list(self, section: str, key: str, default: str) -> List[str]:
+        try:
+            value = self.config[section].get(key, str(default))
+            return value.strip().lower() in _TRUE_VALUES
+        except KeyError:
+            self._add_validation_warning(section, key, default)
+            return default
+
+    @_cached_value
+    def _get_str_list(self, section: str, key: str, default: str) -> Tuple[str, ...]:
         """获取字符串列表"""
-        with self._lock:
-            try:
-                items = self.config[section].get(key, default)
-                return [item.strip() for item in items.split(",") if item.strip()]
-            except KeyError:
-                self._validation_errors.append(
-                    f"配置项 {section}.{key} 值无效，使用默认值: {default}"
-                )
-                return [item.strip() for item in default.split(",") if item.strip()]
+        try:
+            return _split_items(self.config[section].get(key, default))
+        except KeyError:
+            self._add_validation_warning(section, key, default)
+            return _split_items(default)
 
     def validate_config(self) -> None:
         """验证配置"""
@@ -253,24 +513,24 @@ class Config:
         if not self.monitor_directories:
             errors.append("未配置监控目录")
 
-        # 验证媒体库目录
-        try:
-            if not self.library_path.exists():
-                try:
-                    self.library_path.mkdir(parents=True, exist_ok=True)
-                    logger.info(f"创建媒体库目录: {self.library_path}")
-                except Exception as e:
-                    errors.append(
-                        f"媒体库目录不存在且无法创建: {self.library_path} - {e}"
-                    )
-        except Exception as e:
-            errors.append(f"媒体库目录验证失败: {e}")
+        # 验证媒体库目录（仅在目录配置变化时访问文件系统）
+        library_path = self.library_path
+        if library_path != self._validated_library_path:
+            try:
+                if not library_path.exists():
+                    library_path.mkdir(parents=True, exist_ok=True)
+                    logger.info(f"创建媒体库目录: {library_path}")
+                self._validated_library_path = library_path
+            except Exception as e:
+                errors.append(f"媒体库目录不存在且无法创建: {library_path} - {e}")
 
         # 记录验证错误
         for error in errors:
             logger.error(f"配置验证错误: {error}")
 
-        for warning in self._validation_errors:
+        with self._lock:
+            warnings = sorted(self._validation_errors)
+        for warning in warnings:
             logger.warning(warning)
 
         if errors:
@@ -284,10 +544,7 @@ class Config:
             for section in self.config.sections():
                 safe_config[section] = {}
                 for key, value in self.config[section].items():
-                    if any(
-                        sensitive in key.lower()
-                        for sensitive in ["key", "password", "token", "secret", "auth"]
-                    ):
+                    if SENSITIVE_KEY_PATTERN.search(key):
                         if value and value != f"your_{key}":
                             safe_config[section][key] = "***"
                         else:
@@ -298,192 +555,85 @@ class Config:
             return safe_config
 
     # 路径相关属性
-    @property
-    def monitor_directories(self) -> List[Path]:
-        return self._get_path_list("monitor_directories", "")
-
-    @property
-    def library_path(self) -> Path:
-        with self._lock:
-            return Path(self.config["PATHS"].get("library_path", "./media_library"))
-
-    @property
-    def anime_directory(self) -> str:
-        with self._lock:
-            return self.config["PATHS"].get("anime_directory", "动漫")
+    monitor_directories = _option("PATHS", "monitor_directories", "", "path_list")
+    library_path = _option("PATHS", "library_path", "./media_library", "path")
+    anime_directory = _option("PATHS", "anime_directory", "动漫")
 
     # AI相关属性
-    @property
-    def ai_type(self) -> str:
-        with self._lock:
-            return self.config["AI"].get("ai_type", "deepseek")
-
-    @property
-    def ai_max_concurrent(self) -> int:
-        return self._get_int("AI", "ai_max_concurrent", 5)
-
-    @property
-    def ai_max_tokens(self) -> int:
-        return self._get_int("AI", "ai_max_tokens", 200)
-
-    @property
-    def deepseek_api_key(self) -> str:
-        with self._lock:
-            return self.config["AI"].get("deepseek_api_key", "")
-
-    @property
-    def deepseek_url(self) -> str:
-        with self._lock:
-            return self.config["AI"].get("deepseek_url", "https://api.deepseek.com/v1/")
-
-    @property
-    def spark_api_key(self) -> str:
-        with self._lock:
-            return self.config["AI"].get("spark_api_key", "")
-
-    @property
-    def spark_url(self) -> str:
-        with self._lock:
-            return self.config["AI"].get(
-                "spark_url", "https://spark-api-open.xf-yun.com/v1/"
-            )
-
-    @property
-    def spark_model(self) -> str:
-        with self._lock:
-            return self.config["AI"].get("spark_model", "Lite")
-
-    @property
-    def model_scope_api_key(self) -> str:
-        with self._lock:
-            return self.config["AI"].get("model_scope_api_key", "")
-
-    @property
-    def model_scope_url(self) -> str:
-        with self._lock:
-            return self.config["AI"].get(
-                "model_scope_url",
-                "https://api-inference.modelscope.cn/v1/",
-            )
-
-    @property
-    def model_scope_model(self) -> str:
-        with self._lock:
-            return self.config["AI"].get(
-                "model_scope_model", "Qwen3-235B-A22B-Instruct-2507"
-            )
-
-    @property
-    def zhipu_api_key(self) -> str:
-        with self._lock:
-            return self.config["AI"].get("zhipu_api_key", "")
-
-    @property
-    def zhipu_url(self) -> str:
-        with self._lock:
-            return self.config["AI"].get(
-                "zhipu_url", "https://open.bigmodel.cn/api/paas/v4/"
-            )
-
-    @property
-    def zhipu_model(self) -> str:
-        with self._lock:
-            return self.config["AI"].get("zhipu_model", "GLM-4.5-Flash")
+    ai_type = _option("AI", "ai_type", "deepseek")
+    ai_max_concurrent = _option("AI", "ai_max_concurrent", 5)
+    ai_max_tokens = _option("AI", "ai_max_tokens", 200)
+    deepseek_api_key = _option("AI", "deepseek_api_key", "")
+    deepseek_url = _option("AI", "deepseek_url", "https://api.deepseek.com/v1/")
+    spark_api_key = _option("AI", "spark_api_key", "")
+    spark_url = _option("AI", "spark_url", "https://spark-api-open.xf-yun.com/v1/")
+    spark_model = _option("AI", "spark_model", "Lite")
+    model_scope_api_key = _option("AI", "model_scope_api_key", "")
+    model_scope_url = _option(
+        "AI", "model_scope_url", "https://api-inference.modelscope.cn/v1/"
+    )
+    model_scope_model = _option(
+        "AI", "model_scope_model", "Qwen3-235B-A22B-Instruct-2507"
+    )
+    zhipu_api_key = _option("AI", "zhipu_api_key", "")
+    zhipu_url = _option("AI", "zhipu_url", "https://open.bigmodel.cn/api/paas/v4/")
+    zhipu_model = _option("AI", "zhipu_model", "GLM-4.5-Flash")
 
     # TMDB相关属性
-    @property
-    def tmdb_api_key(self) -> str:
-        with self._lock:
-            return self.config["TMDB"].get("tmdb_api_key", "")
-
-    @property
-    def tmdb_proxy(self) -> str:
-        with self._lock:
-            return self.config["TMDB"].get("tmdb_proxy", "")
-
-    @property
-    def cache_expire_days(self) -> int:
-        return self._get_int("TMDB", "cache_expire_days", 30)
+    tmdb_api_key = _option("TMDB", "tmdb_api_key", "")
+    tmdb_proxy = _option("TMDB", "tmdb_proxy", "")
+    cache_expire_days = _option("TMDB", "cache_expire_days", 30)
 
     # 数据库相关属性
-    @property
-    def tmdb_cache_db(self) -> str:
-        with self._lock:
-            return self.config["DATABASE"].get("tmdb_cache_db", "tmdb_cache.db")
-
-    @property
-    def processed_files_db(self) -> str:
-        with self._lock:
-            return self.config["DATABASE"].get(
-                "processed_files_db", "processed_files.db"
-            )
+    tmdb_cache_db = _option("DATABASE", "tmdb_cache_db", "tmdb_cache.db")
+    processed_files_db = _option("DATABASE", "processed_files_db", "processed_files.db")
+    ai_cache_db = _option("DATABASE", "ai_cache_db", "ai_cache.db")
 
     # 系统相关属性
-    @property
-    def worker_threads(self) -> int:
-        return max(1, self._get_int("SYSTEM", "worker_threads", 5))
-
-    @property
-    def stability_worker_threads(self) -> int:
-        return max(1, self._get_int("SYSTEM", "stability_worker_threads", 2))
-
-    @property
-    def md5_worker_threads(self) -> int:
-        return max(1, self._get_int("SYSTEM", "md5_worker_threads", 2))
-
-    @property
-    def log_level(self) -> str:
-        with self._lock:
-            return self.config["SYSTEM"].get("log_level", "INFO")
-
-    @property
-    def initial_scan(self) -> bool:
-        return self._get_bool("SYSTEM", "initial_scan", True)
-
-    @property
-    def watch_events(self) -> List[str]:
-        return self._get_str_list("SYSTEM", "watch_events", "created,moved")
-
-    @property
-    def file_stable_delay(self) -> int:
-        return self._get_int("SYSTEM", "file_stable_delay", 5)
-
-    @property
-    def ignore_patterns(self) -> List[str]:
-        return self._get_str_list(
-            "SYSTEM", "ignore_patterns", "*.tmp,*.part,*.crdownload,*.swp"
-        )
-
-    @property
-    def max_file_wait_time(self) -> int:
-        return self._get_int("SYSTEM", "max_file_wait_time", 300)
-
-    @property
-    def ignore_file_size(self) -> int:
-        mb_size = self._get_int("SYSTEM", "ignore_file_size", 10)
-        return mb_size * 1024 * 1024
-
-    @property
-    def file_retry_interval(self) -> int:
-        return self._get_int("SYSTEM", "file_retry_interval", 5)
-
-    @property
-    def max_pending_files(self) -> int:
-        return self._get_int("SYSTEM", "max_pending_files", 10000)
-
-    @property
-    def performance_monitor_interval(self) -> int:
-        return self._get_int("SYSTEM", "performance_monitor_interval", 60)
-
-    @property
-    def use_md5(self) -> bool:
-        return self._get_bool("SYSTEM", "use_md5", True)
-
-    @property
-    def link_method(self) -> str:
-        with self._lock:
-            return self.config["SYSTEM"].get("link_method", "hardlink")
-
-    @property
-    def auto_reload(self) -> bool:
-        return self._get_bool("SYSTEM", "auto_reload", True)
+    worker_threads = _option("SYSTEM", "worker_threads", 5, convert=_at_least_one)
+    stability_worker_threads = _option(
+        "SYSTEM", "stability_worker_threads", 2, convert=_at_least_one
+    )
+    md5_worker_threads = _option(
+        "SYSTEM", "md5_worker_threads", 2, convert=_at_least_one
+    )
+    scan_workers = _option("SYSTEM", "scan_workers", 4, convert=_at_least_one)
+    log_level = _option("SYSTEM", "log_level", "INFO")
+    initial_scan = _option("SYSTEM", "initial_scan", True)
+    watch_events = _option("SYSTEM", "watch_events", "created,moved", "str_list")
+    file_stable_delay = _option("SYSTEM", "file_stable_delay", 5)
+    ignore_patterns = _option(
+        "SYSTEM", "ignore_patterns", "*.tmp,*.part,*.crdownload,*.swp", "str_list"
+    )
+    # 预编译的忽略模式，每次重载只编译一次
+    ignore_patterns_re = _option(
+        "SYSTEM",
+        "ignore_patterns",
+        "*.tmp,*.part,*.crdownload,*.swp",
+        "str_list",
+        convert=_compile_globs,
+    )
+    max_file_wait_time = _option("SYSTEM", "max_file_wait_time", 300)
+    ignore_file_size = _option("SYSTEM", "ignore_file_size", 10, convert=_mb_to_bytes)
+    file_retry_interval = _option("SYSTEM", "file_retry_interval", 5)
+    max_pending_files = _option("SYSTEM", "max_pending_files", 10000)
+    performance_monitor_interval = _option("SYSTEM", "performance_monitor_interval", 60)
+    use_md5 = _option("SYSTEM", "use_md5", True)
+    hash_chunk_size = _option(
+        "SYSTEM",
+        "hash_chunk_size",
+        1,
+        convert=lambda mb: _mb_to_bytes(max(1, min(16, mb))),
+    )
+    parallel_hash_threshold = _option(
+        "SYSTEM",
+        "parallel_hash_threshold",
+        1024,
+        convert=lambda mb: _mb_to_bytes(max(1, mb)),
+    )
+    strict_content_check = _option("SYSTEM", "strict_content_check", False)
+    link_method = _option("SYSTEM", "link_method", "hardlink")
+    auto_reload = _option("SYSTEM", "auto_reload", True)
+    config_poll_interval = _option(
+        "SYSTEM", "config_poll_interval", 0, convert=lambda value: max(0, value)
+    )
@@ -1,40 +1,306 @@
 import sqlite3
 import json
+import hashlib
+import os
+import zlib
 import time
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import (
+    Optional,
+    Dict,
+    Any,
+    Callable,
+    Iterable,
+    List,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 import logging
 import threading
 import contextlib
 import queue
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:  # 未安装orjson时回退到标准库json
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # 未安装zstandard时使用标准库zlib压缩
+    zstandard = None
+
+from ..utils.helpers import FINGERPRINT_ALGORITHM
 
 logger = logging.getLogger(__name__)
 
 
+# 每个连接缓存的预编译语句数量（默认128）
+CACHED_STATEMENTS = 256
+
+# TMDB缓存数据的压缩等级
+ZSTD_COMPRESSION_LEVEL = 3
+ZLIB_COMPRESSION_LEVEL = 6
+# zstd 帧头魔数；zlib 数据以 0x78 开头；未压缩的 JSON 以 '{' 开头
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_ZLIB_HEADER = b"\x78"
+# zstd 压缩/解压上下文不能跨线程共享，每个线程各自创建
+_codec_local = threading.local()
+
+# 高频SQL语句 - 模块级常量，每次调用传入同一字符串，直接命中连接的语句缓存
+# query_year IS ? 同时匹配年份为空的记录
+_TMDB_CACHE_KEY = "query_type = ? AND query_text = ? AND query_year IS ?"
+_TMDB_CACHE_COLUMNS = (
+    "data_json, tmdb_id, media_type, title, release_year, genres, genre_ids, is_anime"
+)
+_SQL_SELECT_TMDB_CACHE = (
+    f"SELECT {_TMDB_CACHE_COLUMNS} FROM tmdb_cache WHERE {_TMDB_CACHE_KEY}"
+)
+_SQL_TOUCH_TMDB_CACHE = (
+    f"UPDATE tmdb_cache SET last_accessed_time = ? WHERE {_TMDB_CACHE_KEY}"
+)
+# 先原地更新，没有匹配记录时再插入 - 年份为空时唯一约束不生效，无法使用 ON CONFLICT
+_SQL_UPDATE_TMDB_CACHE = f"""
+UPDATE tmdb_cache SET
+    tmdb_id = ?, media_type = ?, title = ?, release_year = ?, genres = ?, genre_ids = ?,
+    is_anime = ?, data_json = ?, created_time = ?, last_accessed_time = ?
+WHERE {_TMDB_CACHE_KEY}
+"""
+_SQL_INSERT_TMDB_CACHE = """
+INSERT INTO tmdb_cache 
+(query_type, query_text, query_year, tmdb_id, media_type, title, release_year, genres, genre_ids, is_anime, data_json, created_time, last_accessed_time)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_DATABASE_USED_BYTES = """
+SELECT (page_count - freelist_count) * page_size
+FROM pragma_page_count(), pragma_freelist_count(), pragma_page_size()
+"""
+
+_SQL_SELECT_AI_CACHE = "SELECT result_json FROM ai_cache WHERE pattern_key = ?"
+_SQL_TOUCH_AI_CACHE = "UPDATE ai_cache SET last_accessed_time = ? WHERE pattern_key = ?"
+_SQL_SET_AI_CACHE = """
+INSERT INTO ai_cache
+(pattern_key, result_json, created_time, last_accessed_time)
+VALUES (?, ?, ?, ?)
+ON CONFLICT(pattern_key) DO UPDATE SET
+    result_json = excluded.result_json,
+    created_time = excluded.created_time,
+    last_accessed_time = excluded.last_accessed_time
+"""
+
+# 按 path_hash 整数索引定位记录，再比较 file_path 排除哈希碰撞
+# +file_path 阻止优化器改用 file_path 的唯一索引（长字符串键，比较开销更大）
+_PROCESSED_PATH_KEY = "path_hash = ? AND +file_path = ?"
+_SQL_IS_PROCESSED_PATH = f"SELECT 1 FROM processed_files WHERE {_PROCESSED_PATH_KEY}"
+_SQL_IS_PROCESSED_FINGERPRINT = f"""
+SELECT 1 FROM processed_files
+WHERE {_PROCESSED_PATH_KEY} AND fingerprint = ? AND fingerprint_algo = ?
+"""
+_SQL_IS_PROCESSED_METADATA = f"""
+SELECT 1 FROM processed_files
+WHERE {_PROCESSED_PATH_KEY} AND file_size = ? AND file_mtime_ns = ?
+"""
+# 不限定路径，重命名/移动后的同一文件也能匹配（走 idx_inode）
+_SQL_IS_PROCESSED_INODE = """
+SELECT 1 FROM processed_files
+WHERE file_dev = ? AND file_ino = ? AND file_size = ? AND file_mtime_ns = ?
+"""
+# 不限定路径，文件移动或重命名后仍能按内容找到已处理记录（走 idx_fingerprint）
+_SQL_FIND_FINGERPRINT = """
+SELECT file_path FROM processed_files
+WHERE fingerprint = ? AND fingerprint_algo = ? AND file_size = ?
+"""
+# 大小和快速指纹相同的记录，以及同一路径下没有快速指纹的旧记录
+_SQL_CONTENT_CANDIDATES = f"""
+SELECT file_path, file_mtime_ns, fingerprint, fingerprint_algo, quick_hash
+FROM processed_files
+WHERE file_size = ? AND (quick_hash = ? OR (quick_hash IS NULL AND {_PROCESSED_PATH_KEY}))
+"""
+_SQL_SET_FINGERPRINT = f"""
+UPDATE processed_files SET fingerprint = ?, fingerprint_algo = ?
+WHERE {_PROCESSED_PATH_KEY} AND fingerprint IS NULL
+"""
+_SQL_REFRESH_IDENTITY = f"""
+UPDATE processed_files
+SET file_mtime_ns = ?, file_dev = ?, file_ino = ?, quick_hash = COALESCE(?, quick_hash)
+WHERE {_PROCESSED_PATH_KEY}
+"""
+# 使用 UPSERT 而非 INSERT OR REPLACE：重复路径走 UPDATE，不会触发计数器的删除/插入触发器
+_SQL_INSERT_PROCESSED = """
+INSERT INTO processed_files 
+(file_path, path_hash, file_md5, file_size, processed_time, tmdb_id, media_type,
+ target_path, fingerprint, fingerprint_algo, file_mtime_ns, quick_hash, file_dev, file_ino)
+VALUES (?, ?, NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(file_path) DO UPDATE SET
+    path_hash = excluded.path_hash,
+    file_md5 = excluded.file_md5,
+    file_size = excluded.file_size,
+    processed_time = excluded.processed_time,
+    tmdb_id = excluded.tmdb_id,
+    media_type = excluded.media_type,
+    target_path = excluded.target_path,
+    fingerprint = excluded.fingerprint,
+    fingerprint_algo = excluded.fingerprint_algo,
+    file_mtime_ns = excluded.file_mtime_ns,
+    quick_hash = excluded.quick_hash,
+    file_dev = excluded.file_dev,
+    file_ino = excluded.file_ino
+"""
+_SQL_PROCESSED_COUNT = (
+    "SELECT value FROM meta_counters WHERE name = 'processed_files_count'"
+)
+
+
+@lru_cache(maxsize=16)
+def _sql_processed_metadata(batch_size: int) -> str:
+    """批量查询已处理文件元数据的语句，相同批大小复用同一字符串"""
+    placeholders = ",".join("?" * batch_size)
+    return f"""
+    SELECT file_path, file_size, file_mtime_ns, file_dev, file_ino FROM processed_files
+    WHERE path_hash IN ({placeholders})
+    """
+
+
+@lru_cache(maxsize=16)
+def _sql_processed_paths(batch_size: int) -> str:
+    """批量查询已处理路径的语句，相同批大小复用同一字符串"""
+    placeholders = ",".join("?" * batch_size)
+    return f"SELECT file_path FROM processed_files WHERE path_hash IN ({placeholders})"
+
+
+# 媒体类型以小整数存储，减小 processed_files 的行大小
+_MEDIA_TYPE_CODES = {"movie": 1, "tv": 2}
+_MEDIA_TYPE_NAMES = {code: name for name, code in _MEDIA_TYPE_CODES.items()}
+
+
+def _path_hash(file_path: str) -> int:
+    """文件路径的64位哈希（有符号，可直接存入 SQLite INTEGER）"""
+    digest = hashlib.blake2b(
+        file_path.encode("utf-8", "surrogateescape"), digest_size=8
+    )
+    return int.from_bytes(digest.digest(), "little", signed=True)
+
+
+def _encode_hash(value: Optional[str]) -> Optional[Union[bytes, str]]:
+    """十六进制哈希按原始字节存储，体积减半；非十六进制的值原样保存"""
+    if not isinstance(value, str):
+        return value
+    try:
+        return bytes.fromhex(value)
+    except ValueError:
+        return value
+
+
+def _decode_hash(value: Optional[Union[bytes, str]]) -> Optional[str]:
+    """还原为十六进制字符串"""
+    if isinstance(value, bytes):
+        return value.hex()
+    return value
+
+
+def _encode_media_type(media_type: Optional[str]) -> Optional[Union[int, str]]:
+    """媒体类型编码为整数，未知类型原样保存"""
+    return _MEDIA_TYPE_CODES.get(media_type, media_type)
+
+
+def _decode_media_type(value: Optional[Union[int, str]]) -> Optional[str]:
+    """还原媒体类型名称 - 旧表的 TEXT 字段会把整数存为 '1' 这样的字符串"""
+    try:
+        return _MEDIA_TYPE_NAMES.get(int(value), value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _json_dumps(obj: Any) -> Union[bytes, str]:
+    """序列化缓存数据，orjson 返回的 bytes 可直接写入 SQLite"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj)
+
+
+def _json_loads(data: Union[bytes, str]) -> Any:
+    """反序列化缓存数据，兼容旧的 TEXT 和新的 bytes 存储"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _compress_payload(data: Union[bytes, str]) -> bytes:
+    """压缩缓存数据 - 优先使用 zstd，未安装时使用 zlib"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if zstandard is not None:
+        compressor = getattr(_codec_local, "compressor", None)
+        if compressor is None:
+            compressor = zstandard.ZstdCompressor(level=ZSTD_COMPRESSION_LEVEL)
+            _codec_local.compressor = compressor
+        return compressor.compress(data)
+    return zlib.compress(data, ZLIB_COMPRESSION_LEVEL)
+
+
+def _decompress_payload(data: Union[bytes, str]) -> Union[bytes, str]:
+    """按数据头部识别压缩格式并解压，兼容旧的未压缩记录"""
+    if isinstance(data, str):
+        return data
+    if data[:4] == _ZSTD_MAGIC:
+        if zstandard is None:
+            raise RuntimeError("缓存数据为zstd压缩格式，但未安装zstandard")
+        decompressor = getattr(_codec_local, "decompressor", None)
+        if decompressor is None:
+            decompressor = zstandard.ZstdDecompressor()
+            _codec_local.decompressor = decompressor
+        return decompressor.decompress(data)
+    if data[:1] == _ZLIB_HEADER:
+        return zlib.decompress(data)
+    return data
+
+
 class ThreadSafeDatabaseConnectionPool:
     """线程安全的数据库连接池"""
 
-    def __init__(self, db_path: str, max_connections: int = 10):
+    def __init__(
+        self, db_path: str, max_connections: int = 10, read_only: bool = False
+    ):
         self.db_path = db_path
         self.max_connections = max_connections
+        self.read_only = read_only
         self._connection_pool = queue.Queue(maxsize=max_connections)
-        self._created_connections = 0
-        self._lock = threading.Lock()
 
-        # 预创建连接
-        for _ in range(min(2, max_connections)):
+        # 启动时创建全部连接并常驻到关闭，运行期间不再新建连接（每次新建都要执行PRAGMA并打开WAL/SHM文件）
+        for _ in range(max_connections):
             self._create_and_add_connection()
+        logger.debug(
+            f"数据库连接池已创建: {db_path}, 连接数: {self._connection_pool.qsize()}"
+        )
 
     def _create_connection(self) -> sqlite3.Connection:
         """创建新的数据库连接"""
-        conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=30.0,
+            check_same_thread=False,
+            cached_statements=CACHED_STATEMENTS,
+        )
         conn.row_factory = sqlite3.Row
 
         # 优化设置
         conn.execute("PRAGMA journal_mode=WAL")
+        # WAL模式下NORMAL只在检查点时fsync，逐条提交不再每次落盘
+        conn.execute("PRAGMA synchronous=NORMAL")
         conn.execute("PRAGMA busy_timeout=5000")
         conn.execute("PRAGMA foreign_keys=ON")
         conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        if self.read_only:
+            # 读连接禁止写入，误用时立即报错而不是争抢写锁
+            conn.execute("PRAGMA query_only=1")
 
         return conn
 
@@ -43,8 +309,6 @@ class ThreadSafeDatabaseConnectionPool:
         try:
             conn = self._create_connection()
             self._connection_pool.put(conn, block=False)
-            with self._lock:
-                self._created_connections += 1
         except Exception as e:
             logger.error(f"创建数据库连接失败: {e}")
 
@@ -53,15 +317,8 @@ class ThreadSafeDatabaseConnectionPool:
         """获取数据库连接（上下文管理器）"""
         conn = None
         try:
-            try:
-                conn = self._connection_pool.get(timeout=10.0)
-            except queue.Empty:
-                with self._lock:
-                    if self._created_connections < self.max_connections:
-                        conn = self._create_connection()
-                        self._created_connections += 1
-                    else:
-                        conn = self._connection_pool.get(timeout=30.0)
+            # 连接数量固定，没有空闲连接时等待其他线程归还
+            conn = self._connection_pool.get(timeout=30.0)
 
             yield conn
         except Exception as e:
@@ -69,10 +326,8 @@ class ThreadSafeDatabaseConnectionPool:
             raise
         finally:
             if conn:
-                try:
-                    self._connection_pool.put(conn, block=False)
-                except queue.Full:
-                    conn.close()
+                # 连接数量固定，归还时队列不会满
+                self._connection_pool.put_nowait(conn)
 
     def close_all(self):
         """关闭所有连接"""
@@ -87,31 +342,302 @@ class ThreadSafeDatabaseConnectionPool:
 class DatabaseManager:
     """数据库管理基类"""
 
-    def __init__(self, db_path: str):
+    # 默认只读连接数量（写连接固定为1个）
+    READ_CONNECTIONS = 9
+    # 后台WAL检查点间隔（秒）
+    WAL_CHECKPOINT_INTERVAL = 30
+    # 写线程每个事务最多合并的写操作数量
+    WRITE_BATCH_SIZE = 64
+
+    def __init__(self, db_path: str, read_connections: Optional[int] = None):
         self.db_path = db_path
         self.logger = logger
-        self.connection_pool = ThreadSafeDatabaseConnectionPool(db_path)
+        # 调用方可按并发读取的线程数设置读连接数量，避免线程排队等待连接
+        read_connections = read_connections or self.READ_CONNECTIONS
+        # WAL 模式下写入本就串行：单个写连接，读连接之间互不等待，也不会拿到正在写事务中的连接
+        # 先创建写连接池，由它把数据库切换到 WAL 模式
+        self.write_pool = ThreadSafeDatabaseConnectionPool(db_path, 1)
+        self.read_pool = ThreadSafeDatabaseConnectionPool(
+            db_path, read_connections, read_only=True
+        )
+
+        # 检查点改由后台线程执行，写入线程提交时不再承担检查点开销
+        with self.get_write_connection() as conn:
+            conn.execute("PRAGMA wal_autocheckpoint=0")
+            # 检查点后WAL文件从头复用，超过上限时截断，避免文件只增不减
+            conn.execute("PRAGMA journal_size_limit=67108864")
+        self._checkpoint_stop = threading.Event()
+        self._checkpoint_thread = threading.Thread(
+            target=self._checkpoint_loop,
+            daemon=True,
+            name=f"WALCheckpoint-{Path(db_path).stem}",
+        )
+        self._checkpoint_thread.start()
+
+        # 所有写操作由单个写线程执行，同一时刻排队的写操作合并到一个事务中提交
+        self._write_queue: "queue.Queue[Optional[Tuple[Callable, Future]]]" = (
+            queue.Queue()
+        )
+        self._writer_closed = False
+        # 检查关闭标志与入队在同一把锁内完成，保证结束标记之后不会再有写操作入队
+        self._writer_lock = threading.Lock()
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop,
+            daemon=True,
+            name=f"DBWriter-{Path(db_path).stem}",
+        )
+        self._writer_thread.start()
+
+    def submit_write(self, operation: Callable[[sqlite3.Connection], Any]) -> Future:
+        """
+        提交写操作到写线程，返回 Future
+        同步调用方等待 result()，无需结果的调用方可以直接返回
+        操作在写线程的事务中执行，不能自行提交
+        """
+        future: Future = Future()
+        with self._writer_lock:
+            if self._writer_closed:
+                raise RuntimeError(f"数据库已关闭: {self.db_path}")
+            self._write_queue.put((operation, future))
+        return future
+
+    def _writer_loop(self) -> None:
+        """写线程主循环 - 取出当前排队的写操作，最多 WRITE_BATCH_SIZE 个合并为一个事务"""
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            stopping = False
+            while len(batch) < self.WRITE_BATCH_SIZE:
+                try:
+                    item = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._run_write_batch(batch)
+            if stopping:
+                return
+
+    def _run_write_batch(self, batch: List[Tuple[Callable, Future]]) -> None:
+        """在一个事务中执行一批写操作 - 每个操作用保存点隔离，单个失败只回滚它自己"""
+        batch = [
+            (operation, future)
+            for operation, future in batch
+            if future.set_running_or_notify_cancel()
+        ]
+        if not batch:
+            return
+
+        outcomes = []
+        try:
+            with self.get_write_connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    for operation, _ in batch:
+                        conn.execute("SAVEPOINT write_operation")
+                        try:
+                            outcomes.append((operation(conn), None))
+                        except Exception as e:
+                            conn.execute("ROLLBACK TO write_operation")
+                            outcomes.append((None, e))
+                        conn.execute("RELEASE write_operation")
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+        except Exception as e:
+            self.logger.error(f"数据库写入事务失败: {e}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        # 提交成功后再通知调用方
+        for (_, future), (result, error) in zip(batch, outcomes):
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def _checkpoint_loop(self) -> None:
+        """定期执行被动检查点控制WAL文件大小，关闭时截断WAL文件"""
+        # 使用独立连接，不占用连接池中的读写连接
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+        except sqlite3.Error as e:
+            self.logger.error(f"创建检查点连接失败: {e}")
+            return
+
+        try:
+            while not self._checkpoint_stop.wait(self.WAL_CHECKPOINT_INTERVAL):
+                try:
+                    conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+                except sqlite3.Error as e:
+                    self.logger.warning(f"WAL检查点失败: {e}")
 
-    def execute_query(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
-        """执行SQL查询"""
-        with self.connection_pool.get_connection() as conn:
             try:
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                conn.commit()
-                return cursor
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
             except sqlite3.Error as e:
+                self.logger.warning(f"截断WAL文件失败: {e}")
+        finally:
+            conn.close()
+
+    def get_read_connection(self):
+        """获取只读连接（上下文管理器）"""
+        return self.read_pool.get_connection()
+
+    def get_write_connection(self):
+        """获取写连接（上下文管理器）"""
+        return self.write_pool.get_connection()
+
+    def close(self) -> None:
+        """执行完已提交的写操作，停止后台线程并关闭读写连接池"""
+        with self._writer_lock:
+            if not self._writer_closed:
+                self._writer_closed = True
+                self._write_queue.put(None)
+        self._writer_thread.join(timeout=30)
+        self._checkpoint_stop.set()
+        self._checkpoint_thread.join(timeout=10)
+        self.write_pool.close_all()
+        self.read_pool.close_all()
+
+    @contextlib.contextmanager
+    def transaction(self, immediate: bool = False):
+        """显式事务（上下文管理器）- 产出游标，退出时只提交一次，出错回滚"""
+        with self.get_write_connection() as conn:
+            # IMMEDIATE 立即获取写锁，避免事务中途升级写锁时与其他写入者冲突
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield conn.cursor()
+                conn.commit()
+            except Exception:
                 conn.rollback()
+                raise
+
+    def execute_read(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
+        """执行只读查询（不提交）"""
+        with self.get_read_connection() as conn:
+            try:
+                return conn.execute(query, params)
+            except sqlite3.Error as e:
                 self.logger.error(f"数据库查询失败: {e}, 查询: {query}")
                 raise
 
+    def execute_write(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
+        """执行单条写语句，等待写线程提交后返回"""
+        try:
+            return self.submit_write(lambda conn: conn.execute(query, params)).result()
+        except sqlite3.Error as e:
+            self.logger.error(f"数据库查询失败: {e}, 查询: {query}")
+            raise
+
+    def execute_many(self, query: str, rows: Iterable[tuple]) -> int:
+        """批量执行写语句，与其他排队的写操作在同一个事务中提交"""
+        try:
+            return self.submit_write(
+                lambda conn: conn.executemany(query, rows).rowcount
+            ).result()
+        except sqlite3.Error as e:
+            self.logger.error(f"数据库批量写入失败: {e}, 查询: {query}")
+            raise
+
 
-class TMDBCacheDB(DatabaseManager):
+class _AccessTimeCacheDB(DatabaseManager):
+    """
+    缓存数据库基类 - 缓存命中的访问时间先记录在内存中，攒够一批或到达间隔再写回
+    读取缓存只使用读连接，不经过写线程
+    """
+
+    # 按缓存键更新访问时间的语句，参数为 (访问时间,) + 缓存键
+    TOUCH_QUERY = ""
+    # 缓存命中的访问时间累计多少条，或距上次写回多少秒后批量写回
+    TOUCH_FLUSH_SIZE = 256
+    TOUCH_FLUSH_INTERVAL = 60
+
+    def __init__(self, db_path: str):
+        super().__init__(db_path)
+        self._touch_lock = threading.Lock()
+        self._pending_touches: Dict[tuple, int] = {}
+        self._last_touch_flush = time.monotonic()
+
+    def _record_touch(self, key: tuple, accessed_time: int) -> None:
+        """记录缓存命中的访问时间，累计足够数量或到达间隔时批量写回"""
+        with self._touch_lock:
+            self._pending_touches[key] = accessed_time
+            flush_touches = (
+                len(self._pending_touches) >= self.TOUCH_FLUSH_SIZE
+                or time.monotonic() - self._last_touch_flush
+                >= self.TOUCH_FLUSH_INTERVAL
+            )
+        if flush_touches:
+            self.flush_access_times()
+
+    def flush_access_times(self) -> None:
+        """把缓存命中的访问时间在一个事务中批量写回数据库"""
+        with self._touch_lock:
+            touches = self._pending_touches
+            self._pending_touches = {}
+            self._last_touch_flush = time.monotonic()
+        if not touches:
+            return
+
+        rows = [(accessed_time,) + key for key, accessed_time in touches.items()]
+
+        def log_failure(future: Future) -> None:
+            if future.exception() is not None:
+                self.logger.error(f"更新缓存访问时间失败: {future.exception()}")
+
+        # 访问时间只影响过期清理，不等待写入完成；写线程按提交顺序执行，
+        # 之后的清理和关闭都会排在这次写回之后
+        try:
+            self.submit_write(
+                lambda conn: conn.executemany(self.TOUCH_QUERY, rows)
+            ).add_done_callback(log_failure)
+        except Exception as e:
+            self.logger.error(f"更新缓存访问时间失败: {e}")
+
+    def close(self) -> None:
+        """写回缓存访问时间后关闭数据库"""
+        self.flush_access_times()
+        super().close()
+
+
+def _decode_genre_ids(raw_genre_ids: Union[bytes, str, None]) -> List[int]:
+    """解析缓存中的 genre_ids"""
+    if not raw_genre_ids:
+        return []
+    try:
+        return _json_loads(raw_genre_ids)
+    except (json.JSONDecodeError, TypeError):
+        return []
+
+
+class TMDBCacheDB(_AccessTimeCacheDB):
     """TMDB缓存数据库管理 - 修复缓存数据结构"""
 
+    # 后续版本新增的字段（旧数据库通过 ALTER TABLE 补齐）
+    ADDED_COLUMNS = {
+        "is_anime": "INTEGER",
+    }
+
+    TOUCH_QUERY = _SQL_TOUCH_TMDB_CACHE
+    # 进程内缓存的最大条目数
+    MEMORY_CACHE_SIZE = 4096
+
     def __init__(self, db_path: str, expire_days: int = 30):
         super().__init__(db_path)
         self.expire_days = expire_days
+
+        # 进程内LRU缓存，热门标题的重复查询无需访问数据库
+        self._memory_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._memory_lock = threading.Lock()
+
         self.create_tables()
 
     def create_tables(self) -> None:
@@ -129,89 +655,104 @@ class TMDBCacheDB(DatabaseManager):
                 release_year INTEGER,
                 genres TEXT,
                 genre_ids TEXT,  -- 新增字段：存储分类ID列表
-                data_json TEXT NOT NULL,
+                is_anime INTEGER,  -- 写入时根据分类ID预先计算
+                data_json BLOB NOT NULL,  -- 压缩后的JSON（zstd 或 zlib）
                 created_time INTEGER NOT NULL,
                 last_accessed_time INTEGER NOT NULL,
                 UNIQUE(query_type, query_text, query_year)
             )
             """,
-            "CREATE INDEX IF NOT EXISTS idx_query ON tmdb_cache(query_type, query_text, query_year)",
+            # UNIQUE 约束自带的索引已覆盖查询键，删除重复的 idx_query 以减少写入开销
+            "DROP INDEX IF EXISTS idx_query",
             "CREATE INDEX IF NOT EXISTS idx_access_time ON tmdb_cache(last_accessed_time)",
             "CREATE INDEX IF NOT EXISTS idx_tmdb_id ON tmdb_cache(tmdb_id)",
         ]
 
-        for query in queries:
-            try:
-                self.execute_query(query)
-            except Exception as e:
-                self.logger.error(f"创建表失败: {e}")
+        try:
+            # 建表、索引和字段迁移在同一个事务中完成
+            with self.transaction() as cursor:
+                for query in queries:
+                    cursor.execute(query)
+                self._migrate_added_columns(cursor)
+        except Exception as e:
+            self.logger.error(f"创建表失败: {e}")
+            return
 
         self.logger.info("TMDB缓存表创建完成")
 
+    def _migrate_added_columns(self, cursor: sqlite3.Cursor) -> None:
+        """迁移后续版本新增的字段 - 旧记录的 is_anime 为空，读取时再根据 genre_ids 判断"""
+        cursor.execute("PRAGMA table_info(tmdb_cache)")
+        column_names = {col["name"] for col in cursor.fetchall()}
+
+        for column, column_type in self.ADDED_COLUMNS.items():
+            if column not in column_names:
+                self.logger.info(f"检测到缺少字段 {column}，正在进行迁移...")
+                cursor.execute(
+                    f"ALTER TABLE tmdb_cache ADD COLUMN {column} {column_type}"
+                )
+
     def get_cache(
         self, query_type: str, query_text: str, year: Optional[int] = None
     ) -> Optional[Dict[str, Any]]:
         """获取缓存 - 修复返回数据结构"""
-        if year is not None:
-            query = """
-            SELECT data_json, tmdb_id, media_type, title, release_year, genres, genre_ids 
-            FROM tmdb_cache 
-            WHERE query_type = ? AND query_text = ? AND query_year = ?
-            """
-            params = (query_type, query_text, year)
-        else:
-            query = """
-            SELECT data_json, tmdb_id, media_type, title, release_year, genres, genre_ids 
-            FROM tmdb_cache 
-            WHERE query_type = ? AND query_text = ?
-            """
-            params = (query_type, query_text)
-
+        current_time = int(time.time())
+        memory_key = (query_type, query_text, year)
+
+        with self._memory_lock:
+            cached = self._memory_cache.get(memory_key)
+            if cached is not None:
+                self._memory_cache.move_to_end(memory_key)
+        if cached is not None:
+            self._record_touch(memory_key, current_time)
+            return cached
         try:
-            cursor = self.execute_query(query, params)
-            result = cursor.fetchone()
-
-            if result:
-                update_query = """
-                UPDATE tmdb_cache SET last_accessed_time = ? 
-                WHERE query_type = ? AND query_text = ? AND query_year = ?
-                """
-                self.execute_query(
-                    update_query, (int(time.time()), query_type, query_text, year)
-                )
-
-                result_dict = dict(result)
-
-                # 解析 genre_ids
-                genre_ids = []
-                if result_dict["genre_ids"]:
-                    try:
-                        genre_ids = json.loads(result_dict["genre_ids"])
-                    except (json.JSONDecodeError, TypeError):
-                        genre_ids = []
-
-                # 构建完整的返回数据
-                return {
-                    "data": json.loads(result_dict["data_json"]),
-                    "tmdb_id": result_dict["tmdb_id"],
-                    "media_type": result_dict["media_type"],
-                    "title": result_dict["title"],
-                    "release_year": result_dict["release_year"],
-                    "genres": (
-                        json.loads(result_dict["genres"])
-                        if result_dict["genres"]
-                        else []
-                    ),
-                    "genre_ids": genre_ids,
-                    "is_anime": 16 in genre_ids,  # 在缓存中直接判断是否为动漫
-                }
-            return None
+            row = self.execute_read(_SQL_SELECT_TMDB_CACHE, memory_key).fetchone()
+            if row is None:
+                return None
+
+            # 直接按列名读取 sqlite3.Row，不再先复制成中间字典
+            # 是否为动漫在写入时已计算，旧记录才需要根据 genre_ids 判断
+            genre_ids = _decode_genre_ids(row["genre_ids"])
+            is_anime = row["is_anime"]
+            if is_anime is None:
+                is_anime = 16 in genre_ids
+
+            # 构建完整的返回数据，结果进入进程内缓存，每条记录只解析一次
+            genres = row["genres"]
+            cached = {
+                "data": _json_loads(_decompress_payload(row["data_json"])),
+                "tmdb_id": row["tmdb_id"],
+                "media_type": row["media_type"],
+                "title": row["title"],
+                "release_year": row["release_year"],
+                "genres": _json_loads(genres) if genres else [],
+                "genre_ids": genre_ids,
+                "is_anime": bool(is_anime),
+            }
+            self._set_memory_cache(memory_key, cached)
+            self._record_touch(memory_key, current_time)
+            return cached
         except Exception as e:
             self.logger.error(f"获取缓存失败: {e}")
             return None
 
-    def set_cache(
-        self,
+    def _set_memory_cache(self, key: tuple, result: Dict[str, Any]) -> None:
+        """写入进程内缓存"""
+        with self._memory_lock:
+            self._memory_cache[key] = result
+            self._memory_cache.move_to_end(key)
+            if len(self._memory_cache) > self.MEMORY_CACHE_SIZE:
+                self._memory_cache.popitem(last=False)
+
+    def _invalidate_memory_cache(self, keys: Iterable[tuple]) -> None:
+        """数据库记录被覆盖后移除对应的进程内缓存"""
+        with self._memory_lock:
+            for key in keys:
+                self._memory_cache.pop(key, None)
+
+    @staticmethod
+    def _build_cache_row(
         query_type: str,
         query_text: str,
         year: Optional[int],
@@ -221,10 +762,9 @@ class TMDBCacheDB(DatabaseManager):
         release_year: int,
         genres: List[str],
         data: Dict[str, Any],
-    ) -> None:
-        """设置缓存 - 保存 genre_ids"""
-        current_time = int(time.time())
-
+        current_time: int,
+    ) -> tuple:
+        """构建一条缓存记录的插入参数"""
         # 从原始数据中提取 genre_ids
         genre_ids = []
         if data and "genres" in data:
@@ -232,47 +772,108 @@ class TMDBCacheDB(DatabaseManager):
                 genre.get("id") for genre in data.get("genres", []) if genre.get("id")
             ]
 
-        query = """
-        INSERT OR REPLACE INTO tmdb_cache 
-        (query_type, query_text, query_year, tmdb_id, media_type, title, release_year, genres, genre_ids, data_json, created_time, last_accessed_time)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
+        return (
+            query_type,
+            query_text,
+            year,
+            tmdb_id,
+            media_type,
+            title,
+            release_year,
+            _json_dumps(genres),
+            _json_dumps(genre_ids),  # 保存 genre_ids
+            int(16 in genre_ids),
+            _compress_payload(_json_dumps(data)),
+            current_time,
+            current_time,
+        )
+
+    def _write_cache_rows(self, rows: List[tuple]) -> None:
+        """在一个事务中写入缓存记录，并移除对应的进程内缓存"""
+        keys = [row[:3] for row in rows]
+
+        def write(conn: sqlite3.Connection) -> None:
+            # 已有记录原地更新，保留行ID且不改动查询键索引
+            for row in rows:
+                cursor = conn.execute(_SQL_UPDATE_TMDB_CACHE, row[3:] + row[:3])
+                if cursor.rowcount == 0:
+                    conn.execute(_SQL_INSERT_TMDB_CACHE, row)
+
+        self.submit_write(write).result()
+        self._invalidate_memory_cache(keys)
+
+    def set_cache(
+        self,
+        query_type: str,
+        query_text: str,
+        year: Optional[int],
+        tmdb_id: int,
+        media_type: str,
+        title: str,
+        release_year: int,
+        genres: List[str],
+        data: Dict[str, Any],
+    ) -> None:
+        """设置缓存 - 保存 genre_ids"""
+        row = self._build_cache_row(
+            query_type,
+            query_text,
+            year,
+            tmdb_id,
+            media_type,
+            title,
+            release_year,
+            genres,
+            data,
+            int(time.time()),
+        )
 
         try:
-            self.execute_query(
-                query,
-                (
-                    query_type,
-                    query_text,
-                    year,
-                    tmdb_id,
-                    media_type,
-                    title,
-                    release_year,
-                    json.dumps(genres),
-                    json.dumps(genre_ids),  # 保存 genre_ids
-                    json.dumps(data),
-                    current_time,
-                    current_time,
-                ),
-            )
+            self._write_cache_rows([row])
             self.logger.debug(
-                f"缓存设置成功: {query_type}/{query_text}/{year}, 动漫: {16 in genre_ids}"
+                f"缓存设置成功: {query_type}/{query_text}/{year}, 动漫: {bool(row[9])}"
             )
         except Exception as e:
             self.logger.error(f"设置缓存失败: {e}")
             raise
 
+    def set_cache_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """批量设置缓存 - 所有记录在同一个事务中写入
+
+        每条记录的键与 set_cache 的参数名一致。
+        """
+        current_time = int(time.time())
+        rows = [
+            self._build_cache_row(current_time=current_time, **record)
+            for record in records
+        ]
+        if not rows:
+            return 0
+
+        try:
+            self._write_cache_rows(rows)
+            self.logger.debug(f"批量缓存设置成功: {len(rows)} 条")
+            return len(rows)
+        except Exception as e:
+            self.logger.error(f"批量设置缓存失败: {e}")
+            raise
+
     def cleanup_expired(self) -> int:
         """清理过期缓存"""
         expire_time = int(time.time()) - (self.expire_days * 24 * 60 * 60)
         query = "DELETE FROM tmdb_cache WHERE last_accessed_time < ?"
 
+        # 先写回内存命中的访问时间，避免仍在使用的记录被误删
+        self.flush_access_times()
+
         try:
-            cursor = self.execute_query(query, (expire_time,))
+            cursor = self.execute_write(query, (expire_time,))
             deleted_count = cursor.rowcount
 
             if deleted_count > 0:
+                # 进程内缓存可能包含已删除的记录，整体清空
+                with self._memory_lock:
+                    self._memory_cache.clear()
                 self.logger.info(f"清理了 {deleted_count} 个过期TMDB缓存记录")
 
             return deleted_count
@@ -285,15 +886,16 @@ class TMDBCacheDB(DatabaseManager):
         stats = {}
 
         try:
-            cursor = self.execute_query("SELECT COUNT(*) FROM tmdb_cache")
+            cursor = self.execute_read("SELECT COUNT(*) FROM tmdb_cache")
             stats["total_cache_count"] = cursor.fetchone()[0]
 
-            cursor = self.execute_query(
+            cursor = self.execute_read(
                 "SELECT query_type, COUNT(*) FROM tmdb_cache GROUP BY query_type"
             )
             stats["cache_by_type"] = dict(cursor.fetchall())
 
-            cursor = self.execute_query("SELECT SUM(LENGTH(data_json)) FROM tmdb_cache")
+            # 按数据库已用页数估算大小，读取元数据即可，无需扫描全表
+            cursor = self.execute_read(_SQL_DATABASE_USED_BYTES)
             total_size_bytes = cursor.fetchone()[0] or 0
             stats["total_cache_size_mb"] = round(total_size_bytes / (1024 * 1024), 2)
 
@@ -303,11 +905,110 @@ class TMDBCacheDB(DatabaseManager):
         return stats
 
 
+class AICacheDB(_AccessTimeCacheDB):
+    """AI解析结果缓存数据库管理"""
+
+    TOUCH_QUERY = _SQL_TOUCH_AI_CACHE
+
+    def __init__(self, db_path: str, expire_days: int = 30):
+        super().__init__(db_path)
+        self.expire_days = expire_days
+        self.create_tables()
+
+    def create_tables(self) -> None:
+        """创建AI缓存表"""
+        queries = [
+            """
+            CREATE TABLE IF NOT EXISTS ai_cache (
+                pattern_key TEXT PRIMARY KEY,
+                result_json TEXT NOT NULL,
+                created_time INTEGER NOT NULL,
+                last_accessed_time INTEGER NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_ai_access_time ON ai_cache(last_accessed_time)",
+        ]
+
+        try:
+            with self.transaction() as cursor:
+                for query in queries:
+                    cursor.execute(query)
+        except Exception as e:
+            self.logger.error(f"创建表失败: {e}")
+            return
+
+        self.logger.info("AI缓存表创建完成")
+
+    def get_cache(self, pattern_key: str) -> Optional[Dict[str, Any]]:
+        """获取缓存的AI解析结果"""
+        try:
+            row = self.execute_read(_SQL_SELECT_AI_CACHE, (pattern_key,)).fetchone()
+            if row is None:
+                return None
+            # 访问时间与TMDB缓存一样延迟批量写回，读取本身不产生写操作
+            self._record_touch((pattern_key,), int(time.time()))
+            return _json_loads(row["result_json"])
+        except Exception as e:
+            self.logger.error(f"获取AI缓存失败: {e}")
+            return None
+
+    def set_cache(self, pattern_key: str, data: Dict[str, Any]) -> None:
+        """保存AI解析结果"""
+        current_time = int(time.time())
+
+        try:
+            self.execute_write(
+                _SQL_SET_AI_CACHE,
+                (pattern_key, _json_dumps(data), current_time, current_time),
+            )
+        except Exception as e:
+            self.logger.error(f"设置AI缓存失败: {e}")
+
+    def cleanup_expired(self) -> int:
+        """清理过期缓存"""
+        expire_time = int(time.time()) - (self.expire_days * 24 * 60 * 60)
+
+        # 先写回缓存命中的访问时间，避免仍在使用的记录被误删
+        self.flush_access_times()
+
+        try:
+            cursor = self.execute_write(
+                "DELETE FROM ai_cache WHERE last_accessed_time < ?", (expire_time,)
+            )
+            deleted_count = cursor.rowcount
+
+            if deleted_count > 0:
+                self.logger.info(f"清理了 {deleted_count} 个过期AI缓存记录")
+
+            return deleted_count
+        except Exception as e:
+            self.logger.error(f"清理过期AI缓存失败: {e}")
+            return 0
+
+
 class ProcessedFilesDB(DatabaseManager):
     """已处理文件数据库管理"""
 
-    def __init__(self, db_path: str):
-        super().__init__(db_path)
+    # 批量查询时每条语句的最大参数数量
+    BATCH_QUERY_SIZE = 500
+
+    # 后续版本新增的字段（旧数据库通过 ALTER TABLE 补齐）
+    ADDED_COLUMNS = {
+        "fingerprint": "BLOB",
+        "fingerprint_algo": "TEXT",
+        "file_mtime_ns": "INTEGER",
+        "quick_hash": "BLOB",
+        "file_dev": "INTEGER",
+        "file_ino": "INTEGER",
+        "path_hash": "INTEGER",
+    }
+
+    # 记录行格式版本（PRAGMA user_version）
+    # 1 = 哈希为BLOB、媒体类型为整数；2 = 填充 path_hash
+    SCHEMA_VERSION = 2
+
+    def __init__(self, db_path: str, read_connections: Optional[int] = None):
+        super().__init__(db_path, read_connections)
         self.create_tables()
 
     def create_tables(self) -> None:
@@ -317,90 +1018,217 @@ class ProcessedFilesDB(DatabaseManager):
             CREATE TABLE IF NOT EXISTS processed_files (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 file_path TEXT UNIQUE NOT NULL,
-                file_md5 TEXT,
+                file_md5 BLOB,
                 file_size INTEGER NOT NULL,
                 processed_time INTEGER NOT NULL,
                 tmdb_id INTEGER,
-                media_type TEXT,
-                target_path TEXT
+                media_type INTEGER,
+                target_path TEXT,
+                fingerprint BLOB,
+                fingerprint_algo TEXT,
+                file_mtime_ns INTEGER,
+                quick_hash BLOB,
+                file_dev INTEGER,
+                file_ino INTEGER,
+                path_hash INTEGER
             )
             """,
-            "CREATE INDEX IF NOT EXISTS idx_file_path ON processed_files(file_path)",
-            "CREATE INDEX IF NOT EXISTS idx_md5 ON processed_files(file_md5)",
+            # UNIQUE 约束自带的索引已覆盖 file_path，路径查询改走 idx_path_hash
+            "DROP INDEX IF EXISTS idx_file_path",
             "CREATE INDEX IF NOT EXISTS idx_processed_time ON processed_files(processed_time)",
             "CREATE INDEX IF NOT EXISTS idx_tmdb_id ON processed_files(tmdb_id)",
         ]
 
-        for query in queries:
-            try:
-                self.execute_query(query)
-            except Exception as e:
-                self.logger.error(f"创建表失败: {e}")
+        try:
+            # 建表、索引和迁移在同一个事务中完成，迁移中途失败时整体回滚
+            with self.transaction() as cursor:
+                for query in queries:
+                    cursor.execute(query)
+                self._migrate_table_structure(cursor)
+                self._migrate_added_columns(cursor)
+                self._migrate_schema_version(cursor)
+                self._create_counters(cursor)
+        except Exception as e:
+            self.logger.error(f"创建表失败: {e}")
+            return
 
-        self._migrate_table_structure()
         self.logger.info("已处理文件表创建完成")
 
-    def _migrate_table_structure(self) -> None:
+    def _migrate_table_structure(self, cursor: sqlite3.Cursor) -> None:
         """迁移表结构"""
-        try:
-            cursor = self.execute_query("PRAGMA table_info(processed_files)")
-            columns = cursor.fetchall()
+        cursor.execute("PRAGMA table_info(processed_files)")
+        columns = cursor.fetchall()
 
-            file_md5_column = next(
-                (col for col in columns if col["name"] == "file_md5"), None
-            )
+        file_md5_column = next(
+            (col for col in columns if col["name"] == "file_md5"), None
+        )
 
-            if file_md5_column and file_md5_column["notnull"] == 1:
-                self.logger.info("检测到file_md5字段有NOT NULL约束，正在进行迁移...")
-
-                self.execute_query(
-                    """
-                CREATE TABLE IF NOT EXISTS processed_files_new (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    file_path TEXT UNIQUE NOT NULL,
-                    file_md5 TEXT,
-                    file_size INTEGER NOT NULL,
-                    processed_time INTEGER NOT NULL,
-                    tmdb_id INTEGER,
-                    media_type TEXT,
-                    target_path TEXT
-                )
+        if file_md5_column and file_md5_column["notnull"] == 1:
+            self.logger.info("检测到file_md5字段有NOT NULL约束，正在进行迁移...")
+
+            cursor.execute(
                 """
-                )
+            CREATE TABLE IF NOT EXISTS processed_files_new (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                file_path TEXT UNIQUE NOT NULL,
+                file_md5 TEXT,
+                file_size INTEGER NOT NULL,
+                processed_time INTEGER NOT NULL,
+                tmdb_id INTEGER,
+                media_type TEXT,
+                target_path TEXT
+            )
+            """
+            )
 
-                self.execute_query(
-                    """
-                INSERT INTO processed_files_new 
-                SELECT id, file_path, file_md5, file_size, processed_time, tmdb_id, media_type, target_path
-                FROM processed_files
+            cursor.execute(
                 """
-                )
+            INSERT INTO processed_files_new 
+            SELECT id, file_path, file_md5, file_size, processed_time, tmdb_id, media_type, target_path
+            FROM processed_files
+            """
+            )
+
+            cursor.execute("DROP TABLE processed_files")
+            cursor.execute("ALTER TABLE processed_files_new RENAME TO processed_files")
 
-                self.execute_query("DROP TABLE processed_files")
-                self.execute_query(
-                    "ALTER TABLE processed_files_new RENAME TO processed_files"
+            # 重新创建索引
+            for index_query in [
+                "CREATE INDEX IF NOT EXISTS idx_processed_time ON processed_files(processed_time)",
+                "CREATE INDEX IF NOT EXISTS idx_tmdb_id ON processed_files(tmdb_id)",
+            ]:
+                cursor.execute(index_query)
+
+            self.logger.info("表结构迁移完成")
+
+    def _migrate_added_columns(self, cursor: sqlite3.Cursor) -> None:
+        """迁移后续版本新增的字段 - 旧记录的MD5保留为 md5 算法的指纹"""
+        cursor.execute("PRAGMA table_info(processed_files)")
+        column_names = {col["name"] for col in cursor.fetchall()}
+
+        for column, column_type in self.ADDED_COLUMNS.items():
+            if column not in column_names:
+                self.logger.info(f"检测到缺少字段 {column}，正在进行迁移...")
+                cursor.execute(
+                    f"ALTER TABLE processed_files ADD COLUMN {column} {column_type}"
                 )
 
-                # 重新创建索引
-                for index_query in [
-                    "CREATE INDEX IF NOT EXISTS idx_file_path ON processed_files(file_path)",
-                    "CREATE INDEX IF NOT EXISTS idx_md5 ON processed_files(file_md5)",
-                    "CREATE INDEX IF NOT EXISTS idx_processed_time ON processed_files(processed_time)",
-                    "CREATE INDEX IF NOT EXISTS idx_tmdb_id ON processed_files(tmdb_id)",
-                ]:
-                    self.execute_query(index_query)
+        if "fingerprint" not in column_names:
+            cursor.execute(
+                """
+            UPDATE processed_files SET fingerprint = file_md5, fingerprint_algo = 'md5'
+            WHERE file_md5 IS NOT NULL
+            """
+            )
+            self.logger.info("文件指纹字段迁移完成")
+
+        for index_query in [
+            "CREATE INDEX IF NOT EXISTS idx_fingerprint ON processed_files(fingerprint)",
+            "CREATE INDEX IF NOT EXISTS idx_quick_hash ON processed_files(file_size, quick_hash)",
+            "CREATE INDEX IF NOT EXISTS idx_inode ON processed_files(file_dev, file_ino)",
+            "CREATE INDEX IF NOT EXISTS idx_path_hash ON processed_files(path_hash)",
+        ]:
+            cursor.execute(index_query)
+
+    def _migrate_schema_version(self, cursor: sqlite3.Cursor) -> None:
+        """按 PRAGMA user_version 依次执行记录格式迁移"""
+        cursor.execute("PRAGMA user_version")
+        version = cursor.fetchone()[0]
+        if version >= self.SCHEMA_VERSION:
+            return
+
+        if version < 1:
+            self._migrate_compact_rows(cursor)
+        if version < 2:
+            self._migrate_path_hash(cursor)
+
+        cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def _migrate_compact_rows(self, cursor: sqlite3.Cursor) -> None:
+        """压缩旧记录 - 哈希转为原始字节，媒体类型转为整数，file_md5 已由 fingerprint 取代"""
+        cursor.execute(
+            "SELECT id, fingerprint, quick_hash, media_type FROM processed_files"
+        )
+        rows = [
+            (
+                _encode_hash(row["fingerprint"]),
+                _encode_hash(row["quick_hash"]),
+                _encode_media_type(row["media_type"]),
+                row["id"],
+            )
+            for row in cursor.fetchall()
+        ]
+        if rows:
+            self.logger.info(f"正在压缩 {len(rows)} 条已处理文件记录...")
+            cursor.executemany(
+                """
+            UPDATE processed_files
+            SET file_md5 = NULL, fingerprint = ?, quick_hash = ?, media_type = ?
+            WHERE id = ?
+            """,
+                rows,
+            )
 
-                self.logger.info("表结构迁移完成")
+        # file_md5 不再写入，其索引只会占用空间
+        cursor.execute("DROP INDEX IF EXISTS idx_md5")
+
+    def _migrate_path_hash(self, cursor: sqlite3.Cursor) -> None:
+        """为旧记录填充 path_hash"""
+        cursor.execute(
+            "SELECT id, file_path FROM processed_files WHERE path_hash IS NULL"
+        )
+        rows = [(_path_hash(row["file_path"]), row["id"]) for row in cursor.fetchall()]
+        if rows:
+            self.logger.info(f"正在为 {len(rows)} 条已处理文件记录填充路径哈希...")
+            cursor.executemany(
+                "UPDATE processed_files SET path_hash = ? WHERE id = ?", rows
+            )
 
-        except Exception as e:
-            self.logger.debug(f"表结构迁移检查完成: {e}")
+    def _create_counters(self, cursor: sqlite3.Cursor) -> None:
+        """创建计数器表和维护触发器 - 已处理文件数量无需每次全表 COUNT(*)"""
+        cursor.execute(
+            """
+        CREATE TABLE IF NOT EXISTS meta_counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+        """
+        )
+        # 仅首次创建时统计一次现有记录数，之后由触发器在同一事务内增减
+        cursor.execute(
+            """
+        INSERT OR IGNORE INTO meta_counters (name, value)
+        SELECT 'processed_files_count', COUNT(*) FROM processed_files
+        """
+        )
+        # 表结构迁移会重建 processed_files 并丢失触发器，因此每次都确保存在
+        cursor.execute(
+            """
+        CREATE TRIGGER IF NOT EXISTS trg_processed_files_insert
+        AFTER INSERT ON processed_files
+        BEGIN
+            UPDATE meta_counters SET value = value + 1
+            WHERE name = 'processed_files_count';
+        END
+        """
+        )
+        cursor.execute(
+            """
+        CREATE TRIGGER IF NOT EXISTS trg_processed_files_delete
+        AFTER DELETE ON processed_files
+        BEGIN
+            UPDATE meta_counters SET value = value - 1
+            WHERE name = 'processed_files_count';
+        END
+        """
+        )
 
     def is_processed_by_path_only(self, file_path: str) -> bool:
         """仅通过文件路径检查是否已处理（不检查MD5）"""
-        query = "SELECT 1 FROM processed_files WHERE file_path = ?"
-
         try:
-            cursor = self.execute_query(query, (file_path,))
+            cursor = self.execute_read(
+                _SQL_IS_PROCESSED_PATH, (_path_hash(file_path), file_path)
+            )
             result = cursor.fetchone() is not None
             if result:
                 self.logger.debug(f"文件路径已处理: {file_path}")
@@ -409,19 +1237,257 @@ class ProcessedFilesDB(DatabaseManager):
             self.logger.error(f"检查文件路径是否已处理失败: {e}")
             return False
 
+    @staticmethod
+    def metadata_key(stat_result: os.stat_result) -> Tuple[int, int, int, int]:
+        """按元数据判断文件未变化时比较的键：（大小, 修改时间, 设备号, inode）"""
+        return (
+            stat_result.st_size,
+            stat_result.st_mtime_ns,
+            stat_result.st_dev,
+            stat_result.st_ino,
+        )
+
+    def is_processed_by_metadata(
+        self,
+        file_path: str,
+        file_size: int,
+        mtime_ns: int,
+        file_dev: Optional[int] = None,
+        file_ino: Optional[int] = None,
+    ) -> bool:
+        """
+        通过元数据检查是否已处理（无需读取文件内容）
+        大小、修改时间、设备号和inode均一致（包括重命名/移动后的同一文件）；
+        未提供inode时按路径、大小和修改时间比较
+        """
+        if file_dev is not None and file_ino is not None:
+            query = _SQL_IS_PROCESSED_INODE
+            params = (file_dev, file_ino, file_size, mtime_ns)
+        else:
+            query = _SQL_IS_PROCESSED_METADATA
+            params = (_path_hash(file_path), file_path, file_size, mtime_ns)
+
+        try:
+            cursor = self.execute_read(query, params)
+            return cursor.fetchone() is not None
+        except Exception as e:
+            self.logger.error(f"通过元数据检查文件是否已处理失败: {e}")
+            return False
+
+    def get_processed_metadata(
+        self, file_paths: List[str]
+    ) -> Dict[str, Tuple[int, Optional[int], Optional[int], Optional[int]]]:
+        """
+        批量获取已处理文件的元数据，与 metadata_key 的顺序一致：
+        （大小, 修改时间, 设备号, inode），未处理的路径不在结果中
+        """
+        records = {}
+
+        for start in range(0, len(file_paths), self.BATCH_QUERY_SIZE):
+            batch = file_paths[start : start + self.BATCH_QUERY_SIZE]
+            query = _sql_processed_metadata(len(batch))
+
+            try:
+                cursor = self.execute_read(query, tuple(map(_path_hash, batch)))
+                # 哈希碰撞可能带回其他路径，调用方按路径取值不受影响
+                for row in cursor.fetchall():
+                    records[row["file_path"]] = (
+                        row["file_size"],
+                        row["file_mtime_ns"],
+                        row["file_dev"],
+                        row["file_ino"],
+                    )
+            except Exception as e:
+                self.logger.error(f"批量查询已处理文件失败: {e}")
+
+        return records
+
+    def filter_unprocessed(self, file_paths: Sequence[str]) -> Set[str]:
+        """批量检查文件路径，返回其中已处理的路径集合，调用方据此过滤出未处理文件"""
+        processed_paths: Set[str] = set()
+        requested_paths = set(file_paths)
+
+        for start in range(0, len(file_paths), self.BATCH_QUERY_SIZE):
+            batch = file_paths[start : start + self.BATCH_QUERY_SIZE]
+            query = _sql_processed_paths(len(batch))
+
+            try:
+                cursor = self.execute_read(query, tuple(map(_path_hash, batch)))
+                # 与请求路径求交集，排除哈希碰撞带回的其他路径
+                processed_paths.update(
+                    row[0] for row in cursor.fetchall() if row[0] in requested_paths
+                )
+            except Exception as e:
+                # 查询失败的路径视为未处理，后续处理流程仍会完整检查
+                self.logger.error(f"批量检查已处理路径失败: {e}")
+
+        return processed_paths
+
+    def find_duplicate(
+        self,
+        file_path: str,
+        file_size: int,
+        quick_hash: str,
+        fingerprint_of: Callable[[str, str], Optional[str]],
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        查找与文件内容相同的已处理记录（不限路径）
+
+        只有大小和快速指纹相同的记录才比较完整指纹。首次处理的记录只保存了快速指纹，
+        此时计算记录对应文件的完整指纹进行比较，并补存到该记录中
+
+        Args:
+            fingerprint_of: 按 (路径, 指纹算法) 计算文件完整指纹，失败时返回 None
+
+        Returns:
+            (内容相同的记录路径, 本文件按当前算法计算的完整指纹)，没有相同内容时路径为 None；
+            没有需要比较的记录时不读取文件内容，指纹为 None
+        """
+        try:
+            rows = self.execute_read(
+                _SQL_CONTENT_CANDIDATES,
+                (
+                    file_size,
+                    _encode_hash(quick_hash),
+                    _path_hash(file_path),
+                    file_path,
+                ),
+            ).fetchall()
+        except Exception as e:
+            self.logger.error(f"查询相同快速指纹的记录失败: {e}")
+            return None, None
+
+        fingerprints: Dict[str, Optional[str]] = {}
+
+        def own_fingerprint(algorithm: str) -> Optional[str]:
+            if algorithm not in fingerprints:
+                fingerprints[algorithm] = fingerprint_of(file_path, algorithm)
+            return fingerprints[algorithm]
+
+        for row in rows:
+            record_path = row["file_path"]
+            stored = _decode_hash(row["fingerprint"])
+            algorithm = row["fingerprint_algo"] or FINGERPRINT_ALGORITHM
+            if stored is None:
+                if row["quick_hash"] is None:
+                    # 旧记录既没有快速指纹也没有完整指纹，无法比较内容
+                    continue
+                if record_path == file_path:
+                    # 同一路径的原内容已无法读取，大小和快速指纹一致即视为未变化
+                    return record_path, fingerprints.get(FINGERPRINT_ALGORITHM)
+                stored = self._fingerprint_record_file(
+                    record_path, file_size, row["file_mtime_ns"], fingerprint_of
+                )
+                if stored is None:
+                    continue
+                algorithm = FINGERPRINT_ALGORITHM
+
+            fingerprint = own_fingerprint(algorithm)
+            if fingerprint is not None and fingerprint == stored:
+                return record_path, fingerprints.get(FINGERPRINT_ALGORITHM)
+
+        return None, fingerprints.get(FINGERPRINT_ALGORITHM)
+
+    def _fingerprint_record_file(
+        self,
+        record_path: str,
+        file_size: int,
+        mtime_ns: Optional[int],
+        fingerprint_of: Callable[[str, str], Optional[str]],
+    ) -> Optional[str]:
+        """计算已处理记录对应文件的完整指纹并补存，文件已删除或已修改时返回 None"""
+        try:
+            stat_result = os.stat(record_path)
+        except OSError:
+            return None
+        if stat_result.st_size != file_size or (
+            mtime_ns is not None and stat_result.st_mtime_ns != mtime_ns
+        ):
+            return None
+
+        fingerprint = fingerprint_of(record_path, FINGERPRINT_ALGORITHM)
+        if fingerprint is None:
+            return None
+        try:
+            self.execute_write(
+                _SQL_SET_FINGERPRINT,
+                (
+                    _encode_hash(fingerprint),
+                    FINGERPRINT_ALGORITHM,
+                    _path_hash(record_path),
+                    record_path,
+                ),
+            )
+        except Exception as e:
+            self.logger.error(f"保存已处理文件指纹失败: {e}")
+        return fingerprint
+
+    def refresh_file_identity(
+        self,
+        file_path: str,
+        mtime_ns: int,
+        file_dev: Optional[int],
+        file_ino: Optional[int],
+        quick_hash: Optional[str] = None,
+    ) -> None:
+        """
+        内容确认未变化后更新记录的修改时间和inode，补上旧记录缺少的快速指纹
+        之后同一文件只需元数据比较即可跳过
+        """
+        try:
+            self.execute_write(
+                _SQL_REFRESH_IDENTITY,
+                (
+                    mtime_ns,
+                    file_dev,
+                    file_ino,
+                    _encode_hash(quick_hash),
+                    _path_hash(file_path),
+                    file_path,
+                ),
+            )
+        except Exception as e:
+            self.logger.error(f"更新已处理文件元数据失败: {e}")
+
+    def find_fingerprint(
+        self,
+        file_size: int,
+        fingerprint: str,
+        fingerprint_algo: str = FINGERPRINT_ALGORITHM,
+    ) -> Optional[str]:
+        """查找相同大小和内容指纹的已处理文件（不限路径），返回其路径"""
+        try:
+            row = self.execute_read(
+                _SQL_FIND_FINGERPRINT,
+                (_encode_hash(fingerprint), fingerprint_algo, file_size),
+            ).fetchone()
+            return row["file_path"] if row is not None else None
+        except Exception as e:
+            self.logger.error(f"检查内容指纹失败: {e}")
+            return None
+
     def is_processed(
-        self, file_path: str, md5: Optional[str] = None, use_md5: bool = True
+        self,
+        file_path: str,
+        fingerprint: Optional[str] = None,
+        use_md5: bool = True,
+        fingerprint_algo: str = FINGERPRINT_ALGORITHM,
     ) -> bool:
         """检查文件是否已处理"""
-        if use_md5 and md5:
-            query = "SELECT 1 FROM processed_files WHERE file_path = ? AND file_md5 = ?"
-            params = (file_path, md5)
+        if use_md5 and fingerprint:
+            query = _SQL_IS_PROCESSED_FINGERPRINT
+            params = (
+                _path_hash(file_path),
+                file_path,
+                _encode_hash(fingerprint),
+                fingerprint_algo,
+            )
         else:
-            query = "SELECT 1 FROM processed_files WHERE file_path = ?"
-            params = (file_path,)
+            query = _SQL_IS_PROCESSED_PATH
+            params = (_path_hash(file_path), file_path)
 
         try:
-            cursor = self.execute_query(query, params)
+            cursor = self.execute_read(query, params)
             result = cursor.fetchone() is not None
             self.logger.debug(
                 f"文件检查结果: {file_path} -> {'已处理' if result else '未处理'}"
@@ -435,57 +1501,72 @@ class ProcessedFilesDB(DatabaseManager):
         self,
         file_path: str,
         file_size: int,
-        md5: Optional[str] = None,
+        fingerprint: Optional[str] = None,
         tmdb_id: Optional[int] = None,
         media_type: Optional[str] = None,
         target_path: Optional[str] = None,
         use_md5: bool = True,
-    ) -> None:
-        """添加已处理文件记录"""
-        if use_md5 and md5:
-            query = """
-            INSERT OR REPLACE INTO processed_files 
-            (file_path, file_md5, file_size, processed_time, tmdb_id, media_type, target_path)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """
-            params = (
-                file_path,
-                md5,
-                file_size,
-                int(time.time()),
-                tmdb_id,
-                media_type,
-                target_path,
-            )
-        else:
-            query = """
-            INSERT OR REPLACE INTO processed_files 
-            (file_path, file_md5, file_size, processed_time, tmdb_id, media_type, target_path)
-            VALUES (?, NULL, ?, ?, ?, ?, ?)
-            """
-            params = (
-                file_path,
-                file_size,
-                int(time.time()),
-                tmdb_id,
-                media_type,
-                target_path,
+        fingerprint_algo: str = FINGERPRINT_ALGORITHM,
+        mtime_ns: Optional[int] = None,
+        quick_hash: Optional[str] = None,
+        file_dev: Optional[int] = None,
+        file_ino: Optional[int] = None,
+        wait: bool = True,
+    ) -> Optional[Future]:
+        """
+        添加已处理文件记录
+
+        Args:
+            wait: 为 False 时只提交给写线程，与其他排队的写入合并到同一事务，
+                返回写入完成时结束的 Future，写入失败只记录日志
+        """
+        if not (use_md5 and fingerprint):
+            fingerprint = None
+            fingerprint_algo = None
+
+        params = (
+            file_path,
+            _path_hash(file_path),
+            file_size,
+            int(time.time()),
+            tmdb_id,
+            _encode_media_type(media_type),
+            target_path,
+            _encode_hash(fingerprint),
+            fingerprint_algo,
+            mtime_ns,
+            _encode_hash(quick_hash),
+            file_dev,
+            file_ino,
+        )
+
+        if not wait:
+
+            def log_result(future: Future) -> None:
+                if future.exception() is not None:
+                    self.logger.error(f"添加已处理文件记录失败: {future.exception()}")
+                else:
+                    self.logger.debug(f"已处理文件记录添加成功: {file_path}")
+
+            future = self.submit_write(
+                lambda conn: conn.execute(_SQL_INSERT_PROCESSED, params)
             )
+            future.add_done_callback(log_result)
+            return future
 
         try:
-            self.execute_query(query, params)
+            self.execute_write(_SQL_INSERT_PROCESSED, params)
             self.logger.debug(f"已处理文件记录添加成功: {file_path}")
         except Exception as e:
             self.logger.error(f"添加已处理文件记录失败: {e}")
             raise
+        return None
 
     def get_processed_count(self) -> int:
-        """获取已处理文件数量"""
-        query = "SELECT COUNT(*) FROM processed_files"
-
+        """获取已处理文件数量 - 读取触发器维护的计数器"""
         try:
-            cursor = self.execute_query(query)
-            return cursor.fetchone()[0]
+            row = self.execute_read(_SQL_PROCESSED_COUNT).fetchone()
+            return row[0] if row else 0
         except Exception as e:
             self.logger.error(f"获取已处理文件数量失败: {e}")
             return 0
@@ -493,15 +1574,23 @@ class ProcessedFilesDB(DatabaseManager):
     def get_recently_processed(self, limit: int = 10) -> List[Dict[str, Any]]:
         """获取最近处理的文件"""
         query = """
-        SELECT file_path, file_md5, file_size, processed_time, tmdb_id, media_type, target_path
+        SELECT file_path, file_md5, file_size, processed_time, tmdb_id, media_type, target_path,
+               fingerprint, fingerprint_algo, file_mtime_ns, quick_hash
         FROM processed_files 
         ORDER BY processed_time DESC 
         LIMIT ?
         """
 
         try:
-            cursor = self.execute_query(query, (limit,))
-            return [dict(row) for row in cursor.fetchall()]
+            cursor = self.execute_read(query, (limit,))
+            records = []
+            for row in cursor.fetchall():
+                record = dict(row)
+                record["media_type"] = _decode_media_type(record["media_type"])
+                record["fingerprint"] = _decode_hash(record["fingerprint"])
+                record["quick_hash"] = _decode_hash(record["quick_hash"])
+                records.append(record)
+            return records
         except Exception as e:
             self.logger.error(f"获取最近处理的文件失败: {e}")
             return []
@@ -512,7 +1601,7 @@ class ProcessedFilesDB(DatabaseManager):
         query = "DELETE FROM processed_files WHERE processed_time < ?"
 
         try:
-            cursor = self.execute_query(query, (cutoff_time,))
+            cursor = self.execute_write(query, (cutoff_time,))
             deleted_count = cursor.rowcount
 
             if deleted_count > 0:
@@ -530,16 +1619,20 @@ class ProcessedFilesDB(DatabaseManager):
         try:
             stats["processed_files_count"] = self.get_processed_count()
 
-            cursor = self.execute_query(
+            cursor = self.execute_read(
                 "SELECT media_type, COUNT(*) FROM processed_files GROUP BY media_type"
             )
-            stats["files_by_media_type"] = dict(cursor.fetchall())
+            files_by_media_type = {}
+            for media_type, count in cursor.fetchall():
+                name = _decode_media_type(media_type)
+                files_by_media_type[name] = files_by_media_type.get(name, 0) + count
+            stats["files_by_media_type"] = files_by_media_type
 
             db_size = Path(self.db_path).stat().st_size
             stats["database_size_mb"] = round(db_size / (1024 * 1024), 2)
 
             day_ago = int(time.time()) - 86400
-            cursor = self.execute_query(
+            cursor = self.execute_read(
                 "SELECT COUNT(*) FROM processed_files WHERE processed_time > ?",
                 (day_ago,),
             )
@@ -1,14 +1,27 @@
+import os
+import shutil
+import stat
 import time
 import threading
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 import psutil
 import requests
-from typing import Callable, Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional, Sequence, Tuple
 from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _stat_or_none(path: Path) -> Optional[os.stat_result]:
+    """一次 stat 同时得到是否存在和文件类型，路径不存在时返回 None"""
+    try:
+        return os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
 class HealthCheck:
     """健康检查基类"""
 
@@ -31,14 +44,14 @@ class DatabaseHealthCheck(HealthCheck):
         """检查数据库健康状态"""
         try:
             # 简单的查询测试
-            start_time = time.time()
-            cursor = self.database_manager.execute_query("SELECT 1")
+            start_ns = time.monotonic_ns()
+            cursor = self.database_manager.execute_read("SELECT 1")
             result = cursor.fetchone()
-            query_time = time.time() - start_time
+            query_ns = time.monotonic_ns() - start_ns
 
             return {
                 "status": "healthy",
-                "query_time_seconds": round(query_time, 4),
+                "query_time_seconds": round(query_ns / 1e9, 4),
                 "test_result": result[0] == 1 if result else False,
             }
         except Exception as e:
@@ -48,10 +61,85 @@ class DatabaseHealthCheck(HealthCheck):
 class FilesystemHealthCheck(HealthCheck):
     """文件系统健康检查"""
 
-    def __init__(self, monitor_directories: List[Path], library_path: Path):
+    def __init__(self, monitor_directories: Sequence[Path], library_path: Path):
         super().__init__("filesystem")
         self.monitor_directories = monitor_directories
         self.library_path = library_path
+        # 实际写入测试的结果；之后的检查只用 os.access 判断，不再产生写操作
+        self._probed: Dict[Path, bool] = {}
+        # 按父目录分组，同一父目录下的多个监控目录只需扫描一次父目录
+        by_parent: Dict[Path, List[Path]] = defaultdict(list)
+        for directory in monitor_directories:
+            by_parent[directory.parent].append(directory)
+        self._by_parent = {
+            parent: children
+            for parent, children in by_parent.items()
+            if len(children) > 1
+        }
+
+    def _scan_shared_parents(self) -> Dict[Path, Optional[bool]]:
+        """
+        对共享父目录的监控目录，每个父目录只做一次 scandir
+        目录项自带文件类型信息，判断是否为目录时不再逐个 stat
+
+        Returns:
+            目录 -> True(是目录) / False(不是目录) / None(不存在)
+        """
+        kinds: Dict[Path, Optional[bool]] = {}
+        for parent, children in self._by_parent.items():
+            try:
+                with os.scandir(parent) as it:
+                    entries = {entry.name: entry for entry in it}
+            except (FileNotFoundError, NotADirectoryError):
+                entries = {}
+            except OSError:
+                # 父目录不可读时交给逐个 stat 处理
+                continue
+
+            for directory in children:
+                entry = entries.get(directory.name)
+                if entry is None:
+                    kinds[directory] = None
+                    continue
+                try:
+                    kinds[directory] = entry.is_dir(follow_symlinks=True)
+                except OSError:
+                    kinds[directory] = None
+        return kinds
+
+    @staticmethod
+    def _dir_kind(directory: Path) -> Optional[bool]:
+        """单个目录的类型判断，一次 stat 完成"""
+        dir_stat = _stat_or_none(directory)
+        if dir_stat is None:
+            return None
+        return stat.S_ISDIR(dir_stat.st_mode)
+
+    def _is_writable(self, directory: Path) -> bool:
+        """
+        检查目录是否可写
+        首次检查或 os.access 判断不可写时，实际创建并删除一个测试文件确认
+        """
+        if directory in self._probed and os.access(directory, os.W_OK):
+            return True
+
+        test_file = directory / ".health_check_test"
+        try:
+            test_file.touch(exist_ok=True)
+            test_file.unlink()
+            writable = True
+        except PermissionError:
+            writable = False
+        self._probed[directory] = writable
+        return writable
+
+    @staticmethod
+    def _free_space_gb(directory: Path) -> Optional[float]:
+        """目录所在分区的剩余空间（GB）"""
+        try:
+            return round(shutil.disk_usage(directory).free / (1024**3), 2)
+        except OSError:
+            return None
 
     def check(self) -> Dict[str, Any]:
         """检查文件系统健康状态"""
@@ -59,38 +147,44 @@ class FilesystemHealthCheck(HealthCheck):
         all_healthy = True
 
         # 检查监控目录
+        scanned_kinds = self._scan_shared_parents()
         for i, directory in enumerate(self.monitor_directories):
             check_key = f"monitor_dir_{i}"
             try:
-                if not directory.exists():
+                if directory in scanned_kinds:
+                    is_dir = scanned_kinds[directory]
+                else:
+                    is_dir = self._dir_kind(directory)
+
+                if is_dir is None:
                     checks[check_key] = {
                         "status": "unhealthy",
                         "error": f"目录不存在: {directory}",
                         "path": str(directory),
                     }
                     all_healthy = False
-                elif not directory.is_dir():
+                elif not is_dir:
                     checks[check_key] = {
                         "status": "unhealthy",
                         "error": f"不是目录: {directory}",
                         "path": str(directory),
                     }
                     all_healthy = False
+                elif not os.access(directory, os.R_OK):
+                    checks[check_key] = {
+                        "status": "unhealthy",
+                        "error": f"目录无读取权限: {directory}",
+                        "path": str(directory),
+                    }
+                    all_healthy = False
                 else:
-                    # 检查读取权限
+                    # 检查写入权限
                     try:
-                        test_file = directory / ".health_check_test"
-                        test_file.touch(exist_ok=True)
-                        test_file.unlink()
-                        checks[check_key] = {
-                            "status": "healthy",
-                            "permissions": "read_write",
-                            "path": str(directory),
-                        }
-                    except PermissionError:
+                        writable = self._is_writable(directory)
                         checks[check_key] = {
                             "status": "healthy",
-                            "permissions": "read_only",
+                            "permissions": "read_write" if writable else "read_only",
+                            "free_gb": self._free_space_gb(directory),
                             "path": str(directory),
                         }
                     except Exception as e:
@@ -110,7 +204,8 @@ class FilesystemHealthCheck(HealthCheck):
 
         # 检查媒体库目录
         try:
-            if not self.library_path.exists():
+            library_stat = _stat_or_none(self.library_path)
+            if library_stat is None:
                 # 尝试创建目录
                 try:
                     self.library_path.mkdir(parents=True, exist_ok=True)
@@ -130,7 +225,7 @@ class FilesystemHealthCheck(HealthCheck):
                     all_healthy = False
             else:
                 # 检查是否是目录
-                if not self.library_path.is_dir():
+                if not stat.S_ISDIR(library_stat.st_mode):
                     checks["library"] = {
                         "status": "unhealthy",
                         "error": "媒体库路径不是目录",
@@ -140,24 +235,20 @@ class FilesystemHealthCheck(HealthCheck):
                 else:
                     # 检查写入权限 - 直接测试媒体库目录本身
                     try:
-                        test_dir = self.library_path / ".health_check_test"
-                        test_dir.mkdir(exist_ok=True)
-                        test_file = test_dir / "test.txt"
-                        test_file.write_text("health_check")
-                        test_file.unlink()
-                        test_dir.rmdir()
-                        checks["library"] = {
-                            "status": "healthy",
-                            "permissions": "read_write",
-                            "path": str(self.library_path),
-                        }
-                    except PermissionError:
-                        checks["library"] = {
-                            "status": "unhealthy",
-                            "error": "媒体库目录无写入权限",
-                            "path": str(self.library_path),
-                        }
-                        all_healthy = False
+                        if self._is_writable(self.library_path):
+                            checks["library"] = {
+                                "status": "healthy",
+                                "permissions": "read_write",
+                                "free_gb": self._free_space_gb(self.library_path),
+                                "path": str(self.library_path),
+                            }
+                        else:
+                            checks["library"] = {
+                                "status": "unhealthy",
+                                "error": "媒体库目录无写入权限",
+                                "path": str(self.library_path),
+                            }
+                            all_healthy = False
                     except Exception as e:
                         checks["library"] = {
                             "status": "unhealthy",
@@ -179,26 +270,83 @@ class FilesystemHealthCheck(HealthCheck):
 class SystemResourcesHealthCheck(HealthCheck):
     """系统资源健康检查"""
 
+    # 磁盘使用率的缓存时间（秒），分区剩余空间在相邻检查间变化很小
+    DISK_USAGE_CACHE_SECONDS = 600
+    MEMINFO_PATH = "/proc/meminfo"
+
     def __init__(self):
         super().__init__("system_resources")
+        # 首次调用只建立基准，之后每次返回距上次调用期间的CPU使用率，无需阻塞等待
+        psutil.cpu_percent(interval=None)
+        self._disk_cache: Optional[tuple] = None
+        # Linux 下保持 /proc/meminfo 打开，每次检查用 pread 从头读取，不再重复打开
+        self._meminfo_fd: Optional[int] = None
+        if hasattr(os, "pread"):
+            try:
+                self._meminfo_fd = os.open(self.MEMINFO_PATH, os.O_RDONLY)
+            except OSError:
+                self._meminfo_fd = None
+
+    def __del__(self):
+        fd = getattr(self, "_meminfo_fd", None)
+        if fd is not None:
+            self._meminfo_fd = None
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _memory_usage(self) -> Tuple[float, int]:
+        """
+        内存使用率和可用内存（字节）
+        优先直接解析 /proc/meminfo 的 MemTotal 和 MemAvailable，其他平台使用 psutil
+        """
+        fd = self._meminfo_fd
+        if fd is not None:
+            try:
+                data = os.pread(fd, 4096, 0)
+                total = available = None
+                for line in data.splitlines():
+                    if line.startswith(b"MemTotal:"):
+                        total = int(line.split()[1]) * 1024
+                    elif line.startswith(b"MemAvailable:"):
+                        available = int(line.split()[1]) * 1024
+                    if total is not None and available is not None:
+                        percent = round((total - available) / total * 100, 1)
+                        return percent, available
+            except (OSError, ValueError, IndexError, ZeroDivisionError):
+                pass
+
+        memory = psutil.virtual_memory()
+        return memory.percent, memory.available
+
+    def _disk_usage(self):
+        """根分区使用情况，在缓存时间内复用上次结果"""
+        now = time.monotonic()
+        if (
+            self._disk_cache is None
+            or now - self._disk_cache[0] >= self.DISK_USAGE_CACHE_SECONDS
+        ):
+            self._disk_cache = (now, psutil.disk_usage("/"))
+        return self._disk_cache[1]
 
     def check(self) -> Dict[str, Any]:
         """检查系统资源状态"""
         try:
-            # CPU使用率
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU使用率（自上次检查以来的平均值）
+            cpu_percent = psutil.cpu_percent(interval=None)
 
             # 内存使用率
-            memory = psutil.virtual_memory()
+            memory_percent, memory_available = self._memory_usage()
 
             # 磁盘使用率（使用第一个分区）
-            disk_usage = psutil.disk_usage("/")
+            disk_usage = self._disk_usage()
 
             return {
                 "status": "healthy",
                 "cpu_percent": cpu_percent,
-                "memory_percent": memory.percent,
-                "memory_available_gb": round(memory.available / (1024**3), 2),
+                "memory_percent": memory_percent,
+                "memory_available_gb": round(memory_available / (1024**3), 2),
                 "disk_percent": disk_usage.percent,
                 "disk_free_gb": round(disk_usage.free / (1024**3), 2),
             }
@@ -206,14 +354,115 @@ class SystemResourcesHealthCheck(HealthCheck):
             return {"status": "unhealthy", "error": str(e)}
 
 
+_TMDB_PLACEHOLDER = "your_tmdb_api_key"
+
+# AI服务类型 -> (配置中的密钥字段, 示例配置中的占位值, 显示名称)
+_AI_PROVIDERS = {
+    "deepseek": ("deepseek_api_key", "your_deepseek_api_key", "DeepSeek API"),
+    "spark": ("spark_api_key", "your_spark_api_key", "讯飞星火API"),
+    "model_scope": (
+        "model_scope_api_key",
+        "your_model_scope_api_key",
+        "魔塔API-Inference",
+    ),
+    "zhipu": ("zhipu_api_key", "your_zhipu_api_key", "智普AI"),
+}
+
+
 class APIHealthCheck(HealthCheck):
     """API健康检查 - 修复版本"""
 
+    # TMDB连接测试成功后的结果缓存时间（秒），失败时下一轮立即重新测试
+    TMDB_PROBE_TTL = 3600
+    # TMDB连接测试的超时时间（连接, 读取），避免TMDB无响应时占住检查线程
+    TMDB_PROBE_TIMEOUT = (3.05, 5)
+
     def __init__(self, tmdb_client, ai_processor, config):
         super().__init__("apis")
         self.tmdb_client = tmdb_client
         self.ai_processor = ai_processor
         self.config = config
+        self._tmdb_cache: Optional[tuple] = None
+
+    def _check_tmdb(self) -> Dict[str, Any]:
+        """检查TMDB API - 成功结果在缓存时间内直接复用，不发起网络请求"""
+        api_key = self.tmdb_client.api_key
+        if not api_key or api_key == _TMDB_PLACEHOLDER:
+            self._tmdb_cache = None
+            return {
+                "status": "unconfigured",
+                "api_key_set": False,
+                "error": "TMDB API密钥未配置，请在config.ini中设置tmdb_api_key",
+            }
+
+        now = time.monotonic()
+        if self._tmdb_cache and now - self._tmdb_cache[0] < self.TMDB_PROBE_TTL:
+            return self._tmdb_cache[1]
+
+        self._tmdb_cache = None
+        # 使用 tmdbsimple 测试连接
+        try:
+            config = self.tmdb_client.get_configuration(timeout=self.TMDB_PROBE_TIMEOUT)
+            if config and "images" in config:
+                client_info = self.tmdb_client.get_client_info()
+                result = {
+                    "status": "healthy",
+                    "api_key_set": True,
+                    "library": client_info["library"],
+                    "version": client_info["version"],
+                    "message": "TMDB API连接正常（使用tmdbsimple）",
+                }
+                self._tmdb_cache = (now, result)
+                return result
+            return {
+                "status": "unhealthy",
+                "api_key_set": True,
+                "error": "TMDB API返回异常响应",
+            }
+        except Exception as e:
+            if "401" in str(e):
+                return {
+                    "status": "unhealthy",
+                    "api_key_set": True,
+                    "error": "TMDB API密钥无效或已过期",
+                }
+            return {
+                "status": "unhealthy",
+                "api_key_set": True,
+                "error": f"TMDB API连接测试失败: {e}",
+            }
+
+    def _check_ai(self) -> Dict[str, Any]:
+        """检查AI服务 - 类型不支持或密钥未配置时直接返回，不调用 ai_processor"""
+        provider = _AI_PROVIDERS.get(self.config.ai_type)
+        if provider is None:
+            return {
+                "status": "unknown",
+                "type": self.config.ai_type,
+                "error": f"不支持的AI类型: {self.config.ai_type}",
+            }
+
+        key_attr, placeholder, label = provider
+        api_key = getattr(self.config, key_attr)
+        if not api_key or api_key == placeholder:
+            return {
+                "status": "unconfigured",
+                "type": self.config.ai_type,
+                "error": f"{label}密钥未配置，请在config.ini中设置{key_attr}",
+            }
+
+        # 使用修复后的 get_ai_status 方法
+        ai_status = self.ai_processor.get_ai_status()
+        return {
+            "status": "configured",
+            "type": self.config.ai_type,
+            "configured": ai_status.get("configured", False),
+            "max_concurrent": ai_status.get("max_concurrent", 0),
+            "available_services": ai_status.get("available_services", []),
+            "message": (
+                f"{label}已配置" if ai_status.get("configured") else f"{label}配置异常"
+            ),
+        }
 
     def check(self) -> Dict[str, Any]:
         """检查API健康状态 - 修复版本"""
@@ -222,166 +471,18 @@ class APIHealthCheck(HealthCheck):
 
         # 检查TMDB API配置
         try:
-            if (
-                not self.tmdb_client.api_key
-                or self.tmdb_client.api_key == "your_tmdb_api_key"
-            ):
-                checks["tmdb"] = {
-                    "status": "unconfigured",
-                    "api_key_set": False,
-                    "error": "TMDB API密钥未配置，请在config.ini中设置tmdb_api_key",
-                }
+            checks["tmdb"] = self._check_tmdb()
+            if checks["tmdb"]["status"] != "healthy":
                 all_healthy = False
-            else:
-                # 使用 tmdbsimple 测试连接
-                try:
-                    config = self.tmdb_client.get_configuration()
-                    if config and "images" in config:
-                        client_info = self.tmdb_client.get_client_info()
-                        checks["tmdb"] = {
-                            "status": "healthy",
-                            "api_key_set": True,
-                            "library": client_info["library"],
-                            "version": client_info["version"],
-                            "message": "TMDB API连接正常（使用tmdbsimple）",
-                        }
-                    else:
-                        checks["tmdb"] = {
-                            "status": "unhealthy",
-                            "api_key_set": True,
-                            "error": "TMDB API返回异常响应",
-                        }
-                        all_healthy = False
-                except Exception as e:
-                    if "401" in str(e):
-                        checks["tmdb"] = {
-                            "status": "unhealthy",
-                            "api_key_set": True,
-                            "error": "TMDB API密钥无效或已过期",
-                        }
-                    else:
-                        checks["tmdb"] = {
-                            "status": "unhealthy",
-                            "api_key_set": True,
-                            "error": f"TMDB API连接测试失败: {e}",
-                        }
-                    all_healthy = False
         except Exception as e:
             checks["tmdb"] = {"status": "error", "error": f"TMDB配置检查失败: {e}"}
             all_healthy = False
 
         # 检查AI服务配置 - 修复版本
         try:
-            # 使用修复后的 get_ai_status 方法
-            ai_status = self.ai_processor.get_ai_status()
-
-            if self.config.ai_type == "deepseek":
-                if (
-                    not self.config.deepseek_api_key
-                    or self.config.deepseek_api_key == "your_deepseek_api_key"
-                ):
-                    checks["ai"] = {
-                        "status": "unconfigured",
-                        "type": "deepseek",
-                        "error": "DeepSeek API密钥未配置，请在config.ini中设置deepseek_api_key",
-                    }
-                    all_healthy = False
-                else:
-                    checks["ai"] = {
-                        "status": "configured",
-                        "type": "deepseek",
-                        "configured": ai_status.get("configured", False),
-                        "max_concurrent": ai_status.get("max_concurrent", 0),
-                        "available_services": ai_status.get("available_services", []),
-                        "message": (
-                            "DeepSeek API已配置"
-                            if ai_status.get("configured")
-                            else "DeepSeek API配置异常"
-                        ),
-                    }
-
-            elif self.config.ai_type == "spark":
-                if (
-                    not self.config.spark_api_key
-                    or self.config.spark_api_key == "your_spark_api_key"
-                ):
-                    checks["ai"] = {
-                        "status": "unconfigured",
-                        "type": "spark",
-                        "error": "讯飞星火API密钥未配置，请在config.ini中设置spark_api_key",
-                    }
-                    all_healthy = False
-                else:
-                    checks["ai"] = {
-                        "status": "configured",
-                        "type": "spark",
-                        "configured": ai_status.get("configured", False),
-                        "max_concurrent": ai_status.get("max_concurrent", 0),
-                        "available_services": ai_status.get("available_services", []),
-                        "message": (
-                            "讯飞星火API已配置"
-                            if ai_status.get("configured")
-                            else "讯飞星火API配置异常"
-                        ),
-                    }
-
-            elif self.config.ai_type == "model_scope":
-                if (
-                    not self.config.model_scope_api_key
-                    or self.config.model_scope_api_key == "your_model_scope_api_key"
-                ):
-                    checks["ai"] = {
-                        "status": "unconfigured",
-                        "type": "model_scope",
-                        "error": "魔塔API-Inference密钥未配置，请在config.ini中设置model_scope_api_key",
-                    }
-                    all_healthy = False
-                else:
-                    checks["ai"] = {
-                        "status": "configured",
-                        "type": "model_scope",
-                        "configured": ai_status.get("configured", False),
-                        "max_concurrent": ai_status.get("max_concurrent", 0),
-                        "available_services": ai_status.get("available_services", []),
-                        "message": (
-                            "魔塔API-Inference已配置"
-                            if ai_status.get("configured")
-                            else "魔塔API-Inference配置异常"
-                        ),
-                    }
-
-            elif self.config.ai_type == "zhipu":
-                if (
-                    not self.config.zhipu_api_key
-                    or self.config.zhipu_api_key == "your_zhipu_api_key"
-                ):
-                    checks["ai"] = {
-                        "status": "unconfigured",
-                        "type": "zhipu",
-                        "error": "智普AI密钥未配置，请在config.ini中设置zhipu_api_key",
-                    }
-                    all_healthy = False
-                else:
-                    checks["ai"] = {
-                        "status": "configured",
-                        "type": "zhipu",
-                        "configured": ai_status.get("configured", False),
-                        "max_concurrent": ai_status.get("max_concurrent", 0),
-                        "available_services": ai_status.get("available_services", []),
-                        "message": (
-                            "智普AI已配置"
-                            if ai_status.get("configured")
-                            else "智普AI配置异常"
-                        ),
-                    }
-            else:
-                checks["ai"] = {
-                    "status": "unknown",
-                    "type": self.config.ai_type,
-                    "error": f"不支持的AI类型: {self.config.ai_type}",
-                }
+            checks["ai"] = self._check_ai()
+            if checks["ai"]["status"] not in ("healthy", "configured"):
                 all_healthy = False
-
         except Exception as e:
             checks["ai"] = {"status": "error", "error": f"AI服务检查失败: {e}"}
             all_healthy = False
@@ -392,20 +493,35 @@ class APIHealthCheck(HealthCheck):
 class HealthMonitor:
     """健康监控器"""
 
-    def __init__(self, check_interval: int = 300):  # 5分钟
+    def __init__(self, check_interval: int = 300, check_timeout: int = 30):  # 5分钟
         self.check_interval = check_interval
+        # 单项检查的超时时间（秒），超时的检查不会拖住其他检查和监控循环
+        self.check_timeout = check_timeout
+        # 写时复制：修改时构建新字典再整体替换引用，读取方无需加锁
         self.health_checks: Dict[str, HealthCheck] = {}
         self.last_results: Dict[str, Any] = {}
+        # 随结果一起预先汇总的状态，查询时无需再遍历结果
+        self._overall_healthy = False
+        self._unhealthy_cached: Tuple[str, ...] = ()
         self.running = False
         self.monitor_thread: Optional[threading.Thread] = None
+        # 只用于串行化 add_health_check 的并发修改
         self._lock = threading.Lock()
+        # 停止信号，等待下一次检查时可被立即唤醒
+        self._stop_event = threading.Event()
+        # 各项检查并行执行；记录未完成的检查，上一次仍未返回时不重复提交
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_workers = 0
+        self._pending_checks: Dict[str, Future] = {}
 
         logger.info(f"初始化健康监控器，检查间隔: {check_interval}秒")
 
     def add_health_check(self, name: str, health_check: HealthCheck):
         """添加健康检查"""
         with self._lock:
-            self.health_checks[name] = health_check
+            health_checks = dict(self.health_checks)
+            health_checks[name] = health_check
+            self.health_checks = health_checks
             logger.debug(f"添加健康检查: {name}")
 
     def start(self):
@@ -415,6 +531,7 @@ class HealthMonitor:
             return
 
         self.running = True
+        self._stop_event.clear()
         self.monitor_thread = threading.Thread(
             target=self._monitor_loop, daemon=True, name="HealthMonitor"
         )
@@ -427,80 +544,128 @@ class HealthMonitor:
             return
 
         self.running = False
+        self._stop_event.set()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=10)
             self.monitor_thread = None
+        if self._executor:
+            # 不等待仍卡住的检查，它们在后台线程中自行结束
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            self._executor_workers = 0
+            self._pending_checks = {}
 
         logger.info("健康监控器已停止")
 
     def _monitor_loop(self):
         """监控循环"""
+        stop_event = self._stop_event
+        interval = self.check_interval
         while self.running:
             try:
-                current_results = {}
-
-                # 执行所有健康检查
-                for name, health_check in self.health_checks.items():
-                    try:
-                        result = health_check.check()
-                        current_results[name] = result
-
-                        # 记录警告状态
-                        if result.get("status") == "unhealthy":
-                            logger.warning(
-                                f"健康检查 '{name}' 失败: {result.get('error', '未知错误')}"
-                            )
-
-                    except Exception as e:
-                        current_results[name] = {
-                            "status": "error",
-                            "error": f"执行检查时发生错误: {e}",
-                        }
-                        logger.error(f"执行健康检查 '{name}' 时发生错误: {e}")
+                current_results, unhealthy_names, any_bad = self._run_checks()
 
                 # 更新结果
-                with self._lock:
-                    self.last_results = current_results
+                # 结果在锁外构建完成后整体替换，引用赋值是原子的
+                self._unhealthy_cached = tuple(unhealthy_names)
+                self._overall_healthy = bool(current_results) and not unhealthy_names
+                self.last_results = current_results
 
                 # 记录周期性状态
-                if any(
-                    result.get("status") in ["unhealthy", "error"]
-                    for result in current_results.values()
-                ):
+                if any_bad:
                     logger.warning("系统健康状态异常")
                 else:
                     logger.debug("系统健康状态正常")
 
             except Exception as e:
-                logger.error(f"健康监控循环发生错误: {e}")
+                logger.error("健康监控循环发生错误: %s", e)
+
+            # 等待下一次检查，停止时立即返回
+            if stop_event.wait(timeout=interval):
+                break
+
+    def _get_executor(self, check_count: int) -> ThreadPoolExecutor:
+        """获取线程数不少于检查项数的线程池
+
+        每项检查同时最多只有一个任务（包括超时后仍卡住的），线程数不少于检查项数时，
+        卡住的检查不会占用其他检查的线程。启动后新增检查时换用更大的线程池，
+        旧线程池中仍在运行的检查照常结束并由 _pending_checks 跟踪
+        """
+        if self._executor is None or self._executor_workers < check_count:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor_workers = max(check_count, 4)
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._executor_workers, thread_name_prefix="HC"
+            )
+        return self._executor
+
+    def _run_checks(self) -> Tuple[Dict[str, Dict[str, Any]], List[str], bool]:
+        """并行执行所有健康检查，总耗时取决于最慢的一项，超时的检查记为错误
+
+        Returns:
+            (检查结果, 非健康组件列表, 是否存在 unhealthy/error 状态)
+        """
+        # 本轮检查使用的快照，期间新增的检查从下一轮开始执行
+        health_checks = tuple(self.health_checks.items())
+        executor = self._get_executor(len(health_checks))
+        pending_checks = self._pending_checks
+
+        for name, health_check in health_checks:
+            # 上一轮超时的检查仍在运行时不再提交，避免卡住的检查占满线程池
+            pending = pending_checks.get(name)
+            if pending is None or pending.done():
+                pending_checks[name] = executor.submit(health_check.check)
+
+        futures = {name: pending_checks[name] for name, _ in health_checks}
+        wait(futures.values(), timeout=self.check_timeout)
+
+        current_results = {}
+        unhealthy_names = []
+        any_bad = False
+        for name, future in futures.items():
+            if not future.done():
+                current_results[name] = {"status": "error", "error": "timeout"}
+                unhealthy_names.append(name)
+                any_bad = True
+                logger.error("健康检查 '%s' 超时（%s秒）", name, self.check_timeout)
+                continue
+
+            try:
+                result = future.result()
+                current_results[name] = result
+                status = result.get("status")
+
+                if status != "healthy":
+                    unhealthy_names.append(name)
+                    if status == "unhealthy" or status == "error":
+                        any_bad = True
+
+                # 记录警告状态
+                if status == "unhealthy":
+                    logger.warning(
+                        "健康检查 '%s' 失败: %s", name, result.get("error", "未知错误")
+                    )
+
+            except Exception as e:
+                current_results[name] = {
+                    "status": "error",
+                    "error": f"执行检查时发生错误: {e}",
+                }
+                unhealthy_names.append(name)
+                any_bad = True
+                logger.error("执行健康检查 '%s' 时发生错误: %s", name, e)
 
-            # 等待下一次检查
-            for _ in range(self.check_interval):
-                if not self.running:
-                    break
-                time.sleep(1)
+        return current_results, unhealthy_names, any_bad
 
     def get_health_status(self) -> Dict[str, Any]:
         """获取健康状态"""
-        with self._lock:
-            return self.last_results.copy()
+        return self.last_results.copy()
 
     def is_healthy(self) -> bool:
         """检查系统是否健康"""
-        with self._lock:
-            if not self.last_results:
-                return False
-
-            return all(
-                result.get("status") == "healthy"
-                for result in self.last_results.values()
-            )
+        return self._overall_healthy
 
     def get_unhealthy_components(self) -> List[str]:
         """获取不健康的组件列表"""
-        with self._lock:
-            return [
-                name
-                for name, result in self.last_results.items()
-                if result.get("status") != "healthy"
-            ]
+        return list(self._unhealthy_cached)
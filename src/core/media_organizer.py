@@ -1,20 +1,31 @@
+import os
 import threading
 import time
-from queue import Queue, Empty
-from typing import Dict, Any, Optional, List
+import itertools
+import logging
+from queue import PriorityQueue, Queue, Empty
+from typing import Callable, Dict, Any, Optional, List, Set, Tuple
 from pathlib import Path
 import signal
 import sys
 import traceback
+from collections import OrderedDict
+from functools import partial
 
 from ..scanners.file_scanner import FileScanner
 from ..scanners.file_monitor import FileMonitor
 from ..processors.ai_processor import AIProcessor
 from ..processors.tmdb_client import TMDBClient
 from ..linkers.file_linker import FileLinker
-from .database import TMDBCacheDB, ProcessedFilesDB
+from .database import TMDBCacheDB, ProcessedFilesDB, AICacheDB
 from ..utils.logging_config import setup_advanced_logging, get_logger
-from ..utils.helpers import is_video_file, calculate_md5, format_file_size
+from ..utils.helpers import (
+    is_video_file,
+    calculate_fingerprint,
+    calculate_quick_hash,
+    format_file_size,
+    FINGERPRINT_ALGORITHM,
+)
 from ..utils.error_handlers import CircuitBreaker, retry_with_backoff, ResourceManager
 from .health_monitor import (
     HealthMonitor,
@@ -27,6 +38,9 @@ from .config import Config, ConfigValidationError
 
 logger = get_logger(__name__)
 
+# 只对可能因网络失败的步骤重试，创建链接和写数据库不会随之重复执行
+_retry_network_call = retry_with_backoff(max_retries=2, initial_delay=2.0)
+
 
 class MediaOrganizer:
     """
@@ -47,7 +61,9 @@ class MediaOrganizer:
         # 初始化工作队列
         self.raw_file_queue = Queue()
         self.stable_file_queue = Queue()
-        self.md5_queue = Queue()
+        # 按 (优先级, 检测时间, 序号) 排序，低优先级文件（初始扫描期间监控到的文件）排在后面处理
+        self.md5_queue = PriorityQueue()
+        self._md5_queue_seq = itertools.count()
 
         # 统计信息
         self.stats = {
@@ -63,6 +79,8 @@ class MediaOrganizer:
             "md5_failed": 0,
             "start_time": time.time(),
         }
+        # 多个工作线程同时更新计数，共用同一把锁
+        self._stats_lock = threading.Lock()
 
         # 控制标志
         self.running = False
@@ -73,8 +91,12 @@ class MediaOrganizer:
         self.initial_scan_thread: Optional[threading.Thread] = None
 
         # 文件去重集合
-        self.pending_files: Dict[str, float] = {}  # 文件路径 -> 添加时间
+        # 文件路径 -> 添加时间，按添加顺序排列，过期条目总在最前面
+        self.pending_files: "OrderedDict[str, float]" = OrderedDict()
         self.pending_files_lock = threading.RLock()
+        # 待处理文件中已收到写入关闭事件的路径，稳定性检查只需确认一次大小不变；
+        # 随待处理条目一起移除（处理完成、失败或过期），不会无限增长
+        self.closed_files: Set[str] = set()
 
         # 性能监控
         self.performance_stats = {
@@ -92,6 +114,8 @@ class MediaOrganizer:
         self.tmdb_circuit_breaker = CircuitBreaker(
             "TMDBClient", failure_threshold=5, reset_timeout=300
         )
+        self._call_ai = partial(self._call_through_breaker, self.ai_circuit_breaker)
+        self._call_tmdb = partial(self._call_through_breaker, self.tmdb_circuit_breaker)
 
         # 健康监控
         self.health_monitor = HealthMonitor(check_interval=300)
@@ -100,8 +124,21 @@ class MediaOrganizer:
         self.resource_manager.register(self, lambda x: x.stop())
         self.resource_manager.register(self.health_monitor, lambda x: x.stop())
 
+        # 配置由 Config 自身的文件监控重载，成功后更新运行中组件的动态配置
+        self.config.add_reload_callback(self._update_dynamic_config)
+
         self.logger.info("媒体文件整理器初始化完成")
 
+    @staticmethod
+    def _call_through_breaker(
+        breaker: CircuitBreaker, func: Callable, *args, **kwargs
+    ) -> Any:
+        """
+        经熔断器调用，重试在熔断器内部进行
+        熔断器开启时立即失败，不再等待重试间隔；重试耗尽后才记为一次失败
+        """
+        return breaker.call(_retry_network_call(func), *args, **kwargs)
+
     def _update_dynamic_config(self):
         """更新可以动态修改的配置"""
         try:
@@ -136,7 +173,17 @@ class MediaOrganizer:
             self.tmdb_cache_db = TMDBCacheDB(
                 self.config.tmdb_cache_db, self.config.cache_expire_days
             )
-            self.processed_files_db = ProcessedFilesDB(self.config.processed_files_db)
+            # 各阶段工作线程都会查询已处理记录，每个线程一个读连接，另留一个给主线程
+            self.processed_files_db = ProcessedFilesDB(
+                self.config.processed_files_db,
+                read_connections=max(1, self.config.stability_worker_threads)
+                + max(1, self.config.md5_worker_threads)
+                + max(1, self.config.worker_threads)
+                + 1,
+            )
+            self.ai_cache_db = AICacheDB(
+                self.config.ai_cache_db, self.config.cache_expire_days
+            )
 
             # 预先执行一些简单查询来建立连接
             self.tmdb_cache_db.get_cache_stats()
@@ -146,22 +193,21 @@ class MediaOrganizer:
 
             # 初始化其他组件
             self.file_scanner = FileScanner(self.processed_files_db, self.config)
-            self.ai_processor = AIProcessor(self.config)
+            self.ai_processor = AIProcessor(self.config, self.ai_cache_db)
             self.tmdb_client = TMDBClient(
                 self.config.tmdb_api_key, self.tmdb_cache_db, self.config.tmdb_proxy
             )
             self.file_linker = FileLinker(
                 self.config.library_path, self.config.anime_directory
             )
-            self.file_monitor = FileMonitor(self.config, self._on_new_file_detected)
+            self.file_monitor = FileMonitor(
+                self.config, self._on_new_file_detected, self._on_file_closed
+            )
 
             # 注册数据库资源
-            self.resource_manager.register(
-                self.tmdb_cache_db, lambda x: x.connection_pool.close_all()
-            )
-            self.resource_manager.register(
-                self.processed_files_db, lambda x: x.connection_pool.close_all()
-            )
+            self.resource_manager.register(self.tmdb_cache_db, lambda x: x.close())
+            self.resource_manager.register(self.processed_files_db, lambda x: x.close())
+            self.resource_manager.register(self.ai_cache_db, lambda x: x.close())
 
         except Exception as e:
             self.logger.error(f"初始化组件失败: {e}")
@@ -208,22 +254,22 @@ class MediaOrganizer:
         if not self._quick_file_check(file_path):
             return
 
-        # 使用绝对路径
+        # 使用绝对路径，只在入口解析一次，之后各阶段沿用 file_info 中的路径
         try:
-            file_path_str = str(file_path.resolve())
+            file_path_str = os.path.realpath(file_path)
         except Exception as e:
             self.logger.warning(f"无法解析文件路径 {file_path}: {e}")
             return
 
         # 1. 首先检查是否已经在处理中
         if not self._add_to_pending(file_path_str):
-            self.logger.debug(f"文件已在处理队列中，跳过: {file_path}")
+            self.logger.debug("文件已在处理队列中，跳过: %s", file_path)
             self._update_stats("duplicate_files")
             return
 
         # 2. 检查是否已处理（在稳定性检查之前）
-        if self._is_file_already_processed(file_path):
-            self.logger.debug(f"文件已处理，跳过: {file_path}")
+        if self._is_file_already_processed(file_path_str):
+            self.logger.debug("文件已处理，跳过: %s", file_path)
             self._remove_from_pending(file_path_str)
             self._update_stats("processed_files")
             return
@@ -239,31 +285,47 @@ class MediaOrganizer:
             }
 
             self.raw_file_queue.put(file_info)
-            self.stats["total_files"] += 1
+            self._update_stats("total_files")
             self.logger.info(f"新文件加入原始文件队列: {file_path}")
         except Exception as e:
             self.logger.error(f"处理新文件失败 {file_path}: {e}")
             self._remove_from_pending(file_path_str)
 
-    def _is_file_already_processed(self, file_path: Path) -> bool:
+    def _on_file_closed(self, file_path: Path) -> None:
         """
-        检查文件是否已处理 - 在稳定性检查之前调用
+        写入方关闭文件时的回调，标记该文件已写完
+        只标记正在等待稳定性检查的文件，之后重新打开写入的文件仍会在轮询中被发现
         """
         try:
-            file_path_str = str(file_path.resolve())
+            file_path_str = os.path.realpath(file_path)
+        except Exception:
+            return
+
+        with self.pending_files_lock:
+            if file_path_str in self.pending_files:
+                self.closed_files.add(file_path_str)
+                self.logger.debug("文件写入已关闭: %s", file_path)
+
+    def _is_file_already_processed(self, file_path_str: str) -> bool:
+        """
+        检查文件是否已处理 - 在稳定性检查之前调用
 
+        Args:
+            file_path_str: 已解析的绝对路径
+        """
+        try:
             # 对于新检测的文件，先不计算MD5（因为文件可能还不稳定）
             # 只检查文件路径是否已处理
             if self.processed_files_db.is_processed(
-                file_path_str, md5=None, use_md5=False
+                file_path_str, fingerprint=None, use_md5=False
             ):
-                self.logger.debug(f"文件路径已处理: {file_path}")
+                self.logger.debug("文件路径已处理: %s", file_path_str)
                 return True
 
             return False
 
         except Exception as e:
-            self.logger.warning(f"检查文件是否已处理失败 {file_path}: {e}")
+            self.logger.warning(f"检查文件是否已处理失败 {file_path_str}: {e}")
             return False
 
     def _quick_file_check(self, file_path: Path) -> bool:
@@ -271,39 +333,28 @@ class MediaOrganizer:
         快速检查文件基本条件（不检查稳定性）
         """
         try:
-            if not file_path.exists():
-                self.logger.debug(f"文件不存在: {file_path}")
-                return False
-
-            if not file_path.is_file():
-                self.logger.debug(f"不是文件: {file_path}")
-                return False
-
+            # 先做只涉及文件名的判断，非视频文件和临时文件不产生文件系统调用
             # 检查是否是视频文件
             if not is_video_file(file_path):
-                self.logger.debug(f"不是视频文件: {file_path}")
+                self.logger.debug("不是视频文件: %s", file_path)
                 return False
 
             # 检查忽略模式
-            filename = file_path.name.lower()
-            for pattern in self.config.ignore_patterns:
-                if pattern.startswith("*") and filename.endswith(pattern[1:]):
-                    self.logger.debug(
-                        f"跳过文件（匹配忽略模式 {pattern}）: {file_path}"
-                    )
-                    return False
-                elif pattern == filename:
-                    self.logger.debug(
-                        f"跳过文件（匹配忽略模式 {pattern}）: {file_path}"
-                    )
-                    return False
+            if self.config.ignore_patterns_re.match(file_path.name):
+                self.logger.debug("跳过文件（匹配忽略模式）: %s", file_path)
+                return False
+
+            # is_file 对不存在的路径返回 False，一次 stat 完成两项检查
+            if not file_path.is_file():
+                self.logger.debug("文件不存在或不是文件: %s", file_path)
+                return False
 
             # 注意：这里不检查文件大小，因为文件可能正在移动/下载中
             # 文件大小检查将在稳定性检查之后进行
 
             return True
         except Exception as e:
-            self.logger.debug(f"快速文件检查失败 {file_path}: {e}")
+            self.logger.debug("快速文件检查失败 %s: %s", file_path, e)
             return False
 
     def _add_to_pending(self, file_path_str: str) -> bool:
@@ -317,16 +368,15 @@ class MediaOrganizer:
             是否成功添加
         """
         with self.pending_files_lock:
-            # 清理过期条目（超过2小时）
-            current_time = time.time()
-            expired_files = [
-                path
-                for path, add_time in self.pending_files.items()
-                if current_time - add_time > 7200  # 2小时
-            ]
-            for expired_file in expired_files:
-                del self.pending_files[expired_file]
-                self.logger.debug(f"清理过期待处理文件: {expired_file}")
+            # 清理过期条目（超过2小时），遇到第一个未过期的条目即可停止
+            current_time = time.monotonic()
+            while self.pending_files:
+                expired_file, add_time = next(iter(self.pending_files.items()))
+                if current_time - add_time <= 7200:  # 2小时
+                    break
+                self.pending_files.popitem(last=False)
+                self.closed_files.discard(expired_file)
+                self.logger.debug("清理过期待处理文件: %s", expired_file)
 
             # 检查是否已存在
             if file_path_str in self.pending_files:
@@ -350,8 +400,8 @@ class MediaOrganizer:
             file_path_str: 文件路径字符串
         """
         with self.pending_files_lock:
-            if file_path_str in self.pending_files:
-                del self.pending_files[file_path_str]
+            self.pending_files.pop(file_path_str, None)
+            self.closed_files.discard(file_path_str)
 
     def _start_initial_scan_async(self) -> None:
         """异步执行初始扫描 - 调整后的版本"""
@@ -363,29 +413,38 @@ class MediaOrganizer:
             duplicate_count = 0
             error_count = 0
             processed_count = 0
+            pending_batch: List[Tuple[Path, int]] = []
 
-            try:
-                # 初始扫描时检查文件大小，因为文件应该是稳定的
-                for file_path, file_size in self.file_scanner.quick_scan_directories(
-                    self.config.monitor_directories, check_size=True
-                ):
-                    if not self.running:
-                        break
+            def flush_batch() -> None:
+                nonlocal duplicate_count, error_count, processed_count
 
+                resolved = []
+                for file_path, file_size in pending_batch:
                     try:
-                        file_path_str = str(file_path.resolve())
+                        resolved.append(
+                            (file_path, os.path.realpath(file_path), file_size)
+                        )
+                    except Exception as e:
+                        error_count += 1
+                        self.logger.warning(f"处理扫描文件失败 {file_path}: {e}")
+                pending_batch.clear()
+
+                # 1. 整批查询已处理路径（在稳定性检查之前），代替逐个文件查询数据库
+                processed_paths = self.processed_files_db.filter_unprocessed(
+                    [file_path_str for _, file_path_str, _ in resolved]
+                )
+
+                for file_path, file_path_str, file_size in resolved:
+                    if file_path_str in processed_paths:
+                        processed_count += 1
+                        continue
 
-                        # 1. 检查是否已经在处理中
+                    try:
+                        # 2. 检查是否已经在处理中
                         if not self._add_to_pending(file_path_str):
                             duplicate_count += 1
                             continue
 
-                        # 2. 检查是否已处理（在稳定性检查之前）
-                        if self._is_file_already_processed(file_path):
-                            processed_count += 1
-                            self._remove_from_pending(file_path_str)
-                            continue
-
                         file_info = {
                             "file_path": file_path_str,
                             "file_size": file_size,
@@ -394,11 +453,26 @@ class MediaOrganizer:
                             "detected_time": time.time(),
                         }
                         self.raw_file_queue.put(file_info)
-                        self.stats["total_files"] += 1
+                        self._update_stats("total_files")
                     except Exception as e:
                         error_count += 1
                         self.logger.warning(f"处理扫描文件失败 {file_path}: {e}")
 
+            try:
+                # 初始扫描时检查文件大小，因为文件应该是稳定的
+                for file_path, file_size in self.file_scanner.quick_scan_directories(
+                    self.config.monitor_directories, check_size=True
+                ):
+                    if not self.running:
+                        break
+
+                    pending_batch.append((file_path, file_size))
+                    if len(pending_batch) >= self.processed_files_db.BATCH_QUERY_SIZE:
+                        flush_batch()
+
+                if self.running and pending_batch:
+                    flush_batch()
+
                 new_files = self.stats["total_files"] - initial_file_count
                 self.logger.info(
                     f"异步初始扫描完成，找到 {new_files} 个新文件，"
@@ -473,14 +547,14 @@ class MediaOrganizer:
                 file_path_str = file_info["file_path"]
                 file_path = Path(file_path_str)
 
-                self.logger.debug(f"检查文件稳定性: {file_path}")
+                self.logger.debug("检查文件稳定性: %s", file_path)
 
                 # 进行稳定性检查
                 if self._check_file_stability(file_path):
                     # 文件稳定，放入稳定文件队列
                     self.stable_file_queue.put(file_info)
                     self._update_stats("stable_files")
-                    self.logger.debug(f"文件稳定: {file_path}")
+                    self.logger.debug("文件稳定: %s", file_path)
                 else:
                     # 文件不稳定，记录统计并从待处理集合中移除
                     self._update_stats("unstable_files")
@@ -509,6 +583,7 @@ class MediaOrganizer:
         """
         start_time = time.time()
         max_wait_time = self.config.max_file_wait_time
+        file_path_str = str(file_path)
 
         # 不再区分小文件和大文件，统一进行稳定性检查
         last_size = -1
@@ -520,12 +595,13 @@ class MediaOrganizer:
                 return False
 
             try:
-                if not file_path.exists():
+                # 一次 stat 同时确认文件存在并取得大小
+                try:
+                    current_size = file_path.stat().st_size
+                except FileNotFoundError:
                     self.logger.warning(f"文件在稳定性检查期间消失: {file_path}")
                     return False
 
-                current_size = file_path.stat().st_size
-
                 # 检查文件大小是否稳定
                 if current_size == last_size:
                     stable_count += 1
@@ -533,8 +609,12 @@ class MediaOrganizer:
                     stable_count = 0
                     last_size = current_size
 
-                # 如果连续多次检查大小都相同，认为文件稳定
-                if stable_count >= max_stable_checks:
+                # 如果连续多次检查大小都相同，认为文件稳定；
+                # 已收到写入关闭事件的文件只需一次确认，避免写入方关闭后又重新打开
+                required_checks = (
+                    1 if file_path_str in self.closed_files else max_stable_checks
+                )
+                if stable_count >= required_checks:
                     # 最后检查文件是否可以访问
                     if self._can_access_file(file_path):
                         # 在稳定性检查之后进行最终的文件大小检查
@@ -545,10 +625,13 @@ class MediaOrganizer:
                             )
                             return False
 
-                        elapsed = time.time() - start_time
-                        self.logger.debug(
-                            f"文件稳定: {file_path} (等待 {elapsed:.1f} 秒, 大小: {format_file_size(current_size)})"
-                        )
+                        if self.logger.isEnabledFor(logging.DEBUG):
+                            self.logger.debug(
+                                "文件稳定: %s (等待 %.1f 秒, 大小: %s)",
+                                file_path,
+                                time.time() - start_time,
+                                format_file_size(current_size),
+                            )
                         return True
 
                 # 等待一段时间再检查
@@ -556,7 +639,7 @@ class MediaOrganizer:
                 time.sleep(wait_time)
 
             except (OSError, PermissionError) as e:
-                self.logger.debug(f"稳定性检查时出错 {file_path}: {e}")
+                self.logger.debug("稳定性检查时出错 %s: %s", file_path, e)
                 time.sleep(2)
 
         self.logger.warning(f"文件稳定性检查超时: {file_path}")
@@ -573,13 +656,25 @@ class MediaOrganizer:
             文件是否可访问
         """
         try:
-            with open(file_path, "rb") as f:
+            # 无缓冲打开，只读取一个字节，不分配读缓冲区
+            with open(file_path, "rb", buffering=0) as f:
                 f.read(1)  # 尝试读取一个字节
             return True
         except (OSError, PermissionError, IOError) as e:
-            self.logger.debug(f"文件无法访问 {file_path}: {e}")
+            self.logger.debug("文件无法访问 %s: %s", file_path, e)
             return False
 
+    def _fingerprint_of(
+        self, file_path_str: str, algorithm: str = FINGERPRINT_ALGORITHM
+    ) -> Optional[str]:
+        """按配置的分块大小计算文件完整指纹，失败时返回 None"""
+        return calculate_fingerprint(
+            Path(file_path_str),
+            chunk_size=self.config.hash_chunk_size,
+            parallel_threshold=self.config.parallel_hash_threshold,
+            algorithm=algorithm,
+        )
+
     def _md5_worker_process(self) -> None:
         """MD5计算工作线程 - 简化版本"""
         thread_name = threading.current_thread().name
@@ -591,35 +686,89 @@ class MediaOrganizer:
                 file_path_str = file_info["file_path"]
                 file_path = Path(file_path_str)
 
-                self.logger.debug(f"计算文件MD5: {file_path}")
+                self.logger.debug("计算文件MD5: %s", file_path)
+
+                # 大小、修改时间和inode均与已处理记录一致时，无需读取文件内容
+                stat_result = file_path.stat()
+                # 检测时记录的大小可能来自下载中的文件，以稳定后的大小为准
+                file_info["file_size"] = stat_result.st_size
+                file_info["mtime_ns"] = stat_result.st_mtime_ns
+                file_info["file_dev"] = stat_result.st_dev
+                file_info["file_ino"] = stat_result.st_ino
+                if (
+                    self.config.use_md5
+                    and not self.config.strict_content_check
+                    and self.processed_files_db.is_processed_by_metadata(
+                        file_path_str, *ProcessedFilesDB.metadata_key(stat_result)
+                    )
+                ):
+                    self.logger.debug("文件元数据未变化，跳过: %s", file_path)
+                    self._update_stats("processed_files")
+                    self._remove_from_pending(file_path_str)
+                    continue
 
-                # 计算MD5（如果启用）
-                md5_hash = None
+                # 先计算只读取首尾区域的快速指纹，只有存在相同大小和快速指纹的已处理记录时
+                # 才读取整个文件比较完整指纹（算法见 FINGERPRINT_ALGORITHM）
+                quick_hash = None
+                content_hash = None
                 if self.config.use_md5:
-                    md5_hash = calculate_md5(file_path)
-                    if not md5_hash:
-                        self.logger.warning(f"无法计算MD5，跳过文件: {file_path}")
-                        self._update_stats("md5_failed")
-                        self._update_stats("failed_files")
-                        self._remove_from_pending(file_path_str)
-                        continue
-
-                    self._update_stats("md5_calculated")
+                    quick_hash = calculate_quick_hash(file_path)
+                    if quick_hash:
+                        duplicate, content_hash = (
+                            self.processed_files_db.find_duplicate(
+                                file_path_str,
+                                stat_result.st_size,
+                                quick_hash,
+                                self._fingerprint_of,
+                            )
+                        )
+                    else:
+                        # 快速指纹计算失败时直接计算完整指纹
+                        content_hash = self._fingerprint_of(file_path_str)
+                        if not content_hash:
+                            self.logger.warning(f"无法计算MD5，跳过文件: {file_path}")
+                            self._update_stats("md5_failed")
+                            self._update_stats("failed_files")
+                            self._remove_from_pending(file_path_str)
+                            continue
+                        duplicate = self.processed_files_db.find_fingerprint(
+                            stat_result.st_size, content_hash
+                        )
 
-                # 使用MD5再次检查是否已处理（更精确的检查）
-                if self.config.use_md5 and md5_hash:
-                    if self.processed_files_db.is_processed(
-                        file_path_str, md5_hash, use_md5=True
-                    ):
-                        self.logger.debug(f"文件MD5已处理，跳过: {file_path}")
+                    if content_hash:
+                        self._update_stats("md5_calculated")
+
+                    if duplicate is not None:
+                        if duplicate == file_path_str:
+                            # 内容未变化（如只修改了时间），更新记录的元数据，下次直接跳过
+                            self.processed_files_db.refresh_file_identity(
+                                file_path_str,
+                                stat_result.st_mtime_ns,
+                                stat_result.st_dev,
+                                stat_result.st_ino,
+                                quick_hash,
+                            )
+                        self.logger.debug(
+                            "文件内容已处理，跳过: %s（相同内容: %s）",
+                            file_path,
+                            duplicate,
+                        )
                         self._update_stats("processed_files")
                         self._remove_from_pending(file_path_str)
                         continue
 
                 # 将文件信息放入处理队列
-                file_info["md5"] = md5_hash
-                self.md5_queue.put(file_info)
-                self.logger.debug(f"文件加入处理队列: {file_path}")
+                file_info["md5"] = content_hash
+                file_info["quick_hash"] = quick_hash
+                self.md5_queue.put(
+                    (
+                        0 if file_info.get("priority") == "normal" else 1,
+                        file_info.get("detected_time", 0),
+                        next(self._md5_queue_seq),
+                        file_info,
+                    )
+                )
+                self.logger.debug("文件加入处理队列: %s", file_path)
 
                 self.stable_file_queue.task_done()
 
@@ -642,11 +791,7 @@ class MediaOrganizer:
 
         while self.running:
             try:
-                file_info = self.md5_queue.get(timeout=1)
-
-                # 如果初始扫描正在进行且这是低优先级任务，稍微延迟处理
-                if self.initial_scan_in_progress and file_info.get("priority") == "low":
-                    time.sleep(2)
+                file_info = self.md5_queue.get(timeout=1)[-1]
 
                 start_time = time.time()
                 self._process_file(file_info)
@@ -670,7 +815,6 @@ class MediaOrganizer:
 
         self.logger.debug(f"工作线程结束: {thread_name}")
 
-    @retry_with_backoff(max_retries=2, initial_delay=2.0)
     def _process_file(self, file_info: Dict[str, Any]) -> None:
         """
         处理单个文件（AI识别、TMDB查询、创建硬链接）
@@ -680,13 +824,15 @@ class MediaOrganizer:
         """
         file_path_str = file_info["file_path"]
         file_path = Path(file_path_str)
+        # 记录提交给写线程后，等写入完成再移出待处理集合，期间重复的事件仍会被去重
+        release_pending = True
 
         try:
             self.logger.info(f"处理文件: {file_path}")
 
             # 1. 使用AI提取信息（带熔断器）
             try:
-                ai_data = self.ai_circuit_breaker.call(
+                ai_data = self._call_ai(
                     self.ai_processor.extract_media_info, file_path.name
                 )
             except Exception as e:
@@ -701,18 +847,18 @@ class MediaOrganizer:
                 self._update_stats("failed_files")
                 return
 
-            self.logger.debug(f"AI解析结果: {ai_data}")
+            self.logger.debug("AI解析结果: %s", ai_data)
 
             # 2. 查询TMDB（带熔断器）
             try:
                 if ai_data["type"] == "movie":
-                    tmdb_data = self.tmdb_circuit_breaker.call(
+                    tmdb_data = self._call_tmdb(
                         self.tmdb_client.search_movie,
                         ai_data["title"],
                         ai_data.get("year"),
                     )
                 else:
-                    tmdb_data = self.tmdb_circuit_breaker.call(
+                    tmdb_data = self._call_tmdb(
                         self.tmdb_client.search_tv, ai_data["title"]
                     )
             except Exception as e:
@@ -740,8 +886,8 @@ class MediaOrganizer:
             # 4. 创建硬链接
             target_path = self.file_linker.organize_file(file_info, tmdb_data, ai_data)
             if target_path:
-                # 5. 记录已处理文件
-                self.processed_files_db.add_processed_file(
+                # 5. 记录已处理文件（不等待提交，写线程把并发的写入合并到一个事务）
+                write = self.processed_files_db.add_processed_file(
                     file_path_str,
                     file_info["file_size"],
                     file_info["md5"],
@@ -749,7 +895,16 @@ class MediaOrganizer:
                     media_type=tmdb_data["media_type"],
                     target_path=str(target_path),
                     use_md5=self.config.use_md5,
+                    mtime_ns=file_info.get("mtime_ns"),
+                    file_dev=file_info.get("file_dev"),
+                    file_ino=file_info.get("file_ino"),
+                    quick_hash=file_info.get("quick_hash"),
+                    wait=False,
                 )
+                write.add_done_callback(
+                    lambda _: self._remove_from_pending(file_path_str)
+                )
+                release_pending = False
                 self._update_stats("successful_links")
                 self.logger.info(f"文件处理完成: {file_path} -> {target_path}")
             else:
@@ -762,9 +917,9 @@ class MediaOrganizer:
             self.logger.error(f"处理文件失败 {file_path}: {e}")
             self.logger.debug(f"详细错误: {traceback.format_exc()}")
             self._update_stats("failed_files")
-            raise  # 重新抛出异常以便重试机制工作
         finally:
-            self._remove_from_pending(file_path_str)
+            if release_pending:
+                self._remove_from_pending(file_path_str)
 
     def _update_stats(self, stat_key: str) -> None:
         """
@@ -773,7 +928,7 @@ class MediaOrganizer:
         Args:
             stat_key: 统计键名
         """
-        with threading.Lock():
+        with self._stats_lock:
             self.stats[stat_key] += 1
 
     def _update_performance_stats(self, processing_time: float) -> None:
@@ -828,6 +983,7 @@ class MediaOrganizer:
             deleted_count = self.tmdb_cache_db.cleanup_expired()
             if deleted_count > 0:
                 self.logger.info(f"清理了 {deleted_count} 个过期TMDB缓存记录")
+            self.ai_cache_db.cleanup_expired()
         except Exception as e:
             self.logger.error(f"清理过期缓存失败: {e}")
             self.logger.debug(f"详细错误: {traceback.format_exc()}")
@@ -971,30 +1127,11 @@ class MediaOrganizer:
             last_cache_cleanup = time.time()
             last_status_log = time.time()
             last_health_check = time.time()
-            last_config_check = time.time()
 
             while self.running:
                 time.sleep(5)  # 降低主循环频率
                 current_time = time.time()
 
-                # 定期检查配置变化（每30秒）
-                if current_time - last_config_check >= 30:
-                    if self.config._should_reload():
-                        self.logger.info("检测到配置文件变化，重新加载配置...")
-                        try:
-                            old_log_level = self.config.log_level
-                            self.config.load_config()
-                            self.config.validate_config()
-
-                            # 更新动态配置
-                            self._update_dynamic_config()
-
-                            self.logger.info("配置重载成功")
-                        except Exception as e:
-                            self.logger.error(f"配置重载失败: {e}")
-
-                    last_config_check = current_time
-
                 # 定期清理过期缓存（每天一次）
                 if current_time - last_cache_cleanup >= 86400:  # 24小时
                     self._cleanup_expired_cache()
@@ -1097,9 +1234,11 @@ class MediaOrganizer:
         # 清理数据库连接池（重要！）
         try:
             if hasattr(self, "tmdb_cache_db"):
-                self.tmdb_cache_db.connection_pool.close_all()
+                self.tmdb_cache_db.close()
             if hasattr(self, "processed_files_db"):
-                self.processed_files_db.connection_pool.close_all()
+                self.processed_files_db.close()
+            if hasattr(self, "ai_cache_db"):
+                self.ai_cache_db.close()
             self.logger.info("数据库连接池已关闭")
         except Exception as e:
             self.logger.error(f"关闭数据库连接池失败: {e}")
@@ -1,10 +1,19 @@
 import logging
 import os
 import shutil
+import sys
 from pathlib import Path
 from typing import Optional, Dict, Any
 from ..utils.helpers import safe_file_operation
 
+try:
+    import fcntl
+except ImportError:  # Windows 不支持 ioctl
+    fcntl = None
+
+# Linux FICLONE ioctl：在 btrfs/xfs 等文件系统上以写时复制方式克隆文件
+FICLONE = 0x40049409
+
 
 class FileLinker:
     """文件链接器 - 负责文件组织和链接创建"""
@@ -140,13 +149,49 @@ class FileLinker:
     def _copy_file(self, source_path: Path, target_path: Path) -> bool:
         """复制文件"""
         try:
-            shutil.copy2(str(source_path), str(target_path))
-            self.logger.info(f"文件复制成功: {source_path} -> {target_path}")
+            method = self._fast_copy(source_path, target_path)
+            self.logger.info(f"文件复制成功({method}): {source_path} -> {target_path}")
             return True
         except Exception as e:
             self.logger.error(f"复制文件失败: {e}")
+            # 目标存在即视为已处理，不能留下不完整的文件
+            try:
+                target_path.unlink()
+            except OSError:
+                pass
             return False
 
+    def _fast_copy(self, source_path: Path, target_path: Path) -> str:
+        """依次尝试 reflink、内核态复制和 shutil 复制，返回实际使用的方式"""
+        if fcntl is not None and sys.platform.startswith("linux"):
+            try:
+                with open(source_path, "rb") as src, open(target_path, "wb") as dst:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                shutil.copystat(str(source_path), str(target_path))
+                return "reflink"
+            except OSError:
+                pass
+
+        if hasattr(os, "copy_file_range"):
+            try:
+                with open(source_path, "rb") as src, open(target_path, "wb") as dst:
+                    remaining = os.fstat(src.fileno()).st_size
+                    while remaining > 0:
+                        copied = os.copy_file_range(
+                            src.fileno(), dst.fileno(), remaining
+                        )
+                        if copied == 0:
+                            break
+                        remaining -= copied
+                if remaining == 0:
+                    shutil.copystat(str(source_path), str(target_path))
+                    return "copy_file_range"
+            except OSError:
+                pass
+
+        shutil.copy2(str(source_path), str(target_path))
+        return "copy"
+
     def organize_file(
         self,
         media_info: Dict[str, Any],
@@ -1,17 +1,41 @@
+import hashlib
 import json
 import logging
+import re
 import threading
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
 from openai import OpenAI, OpenAIError
+from ..core.database import AICacheDB
+
+# 集数标记（S01E02、EP02、第02集），同一季的文件名只有这部分不同
+EPISODE_PATTERNS = [
+    re.compile(r"(?<![a-z0-9])(s\d{1,2})[ ._-]?e(\d{1,4})(?!\d)"),
+    re.compile(r"(?<![a-z0-9])ep?(\d{1,4})(?!\d)"),
+    re.compile(r"第(\d{1,4})[集话話]"),
+]
+# 与解析结果无关的分辨率、编码标记
+NOISE_PATTERN = re.compile(
+    r"(?<![a-z0-9])(\d{3,4}p|[248]k|x26[45]|h\.?26[45]|hevc|avc|10bit|hdr)(?![a-z0-9])"
+)
+SEPARATOR_PATTERN = re.compile(r"[\s._-]+")
 
 
 class AIProcessor:
     """AI处理器 - 支持多种AI服务"""
 
-    def __init__(self, config):
+    # 进程内缓存的最大条目数
+    MEMORY_CACHE_SIZE = 4096
+
+    def __init__(self, config, cache_db: Optional[AICacheDB] = None):
         self.config = config
+        self.cache_db = cache_db
         self.logger = logging.getLogger(__name__)
 
+        # 解析结果缓存（进程内LRU + 持久化数据库）
+        self._memory_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._memory_cache_lock = threading.Lock()
+
         # 初始化客户端
         self.clients = {}
         self._init_clients()
@@ -24,6 +48,7 @@ class AIProcessor:
             "total_requests": 0,
             "successful_requests": 0,
             "failed_requests": 0,
+            "cache_hits": 0,
             "last_error": None,
         }
 
@@ -67,6 +92,14 @@ class AIProcessor:
             self.logger.error(f"AI服务未配置: {self.config.ai_type}")
             return None
 
+        # 同一季的文件名通常只有集数不同，命中缓存时无需再请求AI
+        cache_key, episode = self._build_cache_key(filename)
+        cached = self._get_cached_result(cache_key, episode)
+        if cached:
+            self.stats["cache_hits"] += 1
+            self.logger.debug(f"使用AI缓存: {filename}")
+            return cached
+
         # 获取信号量
         acquired = self.semaphore.acquire(blocking=False)
         if not acquired:
@@ -78,6 +111,7 @@ class AIProcessor:
             result = self._extract_with_client(filename, self.config.ai_type)
             if result:
                 self.stats["successful_requests"] += 1
+                self._set_cached_result(cache_key, episode, result)
             else:
                 self.stats["failed_requests"] += 1
             return result
@@ -89,6 +123,69 @@ class AIProcessor:
         finally:
             self.semaphore.release()
 
+    def _build_cache_key(self, filename: str) -> Tuple[str, Optional[int]]:
+        """将文件名规范化为缓存键，返回（缓存键, 文件名中的集数）"""
+        normalized = NOISE_PATTERN.sub(" ", filename.lower())
+        normalized = SEPARATOR_PATTERN.sub(" ", normalized).strip()
+        episode = None
+
+        for pattern in EPISODE_PATTERNS:
+            match = pattern.search(normalized)
+            if match:
+                episode = int(match.group(match.lastindex))
+                start, end = match.span(match.lastindex)
+                normalized = normalized[:start] + "{episode}" + normalized[end:]
+                break
+
+        cache_key = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        return cache_key, episode
+
+    def _get_cached_result(
+        self, cache_key: str, episode: Optional[int]
+    ) -> Optional[Dict[str, Any]]:
+        """获取缓存的解析结果，并替换为当前文件的集数"""
+        with self._memory_cache_lock:
+            cached = self._memory_cache.get(cache_key)
+            if cached is not None:
+                self._memory_cache.move_to_end(cache_key)
+
+        if cached is None and self.cache_db:
+            cached = self.cache_db.get_cache(cache_key)
+            if cached:
+                self._remember(cache_key, cached)
+
+        if not cached:
+            return None
+
+        result = dict(cached)
+        if result.get("type") == "tv" and episode is not None:
+            result["episode"] = episode
+        return result
+
+    def _set_cached_result(
+        self, cache_key: str, episode: Optional[int], result: Dict[str, Any]
+    ):
+        """缓存解析结果"""
+        # 集数与文件名不一致时说明模板不可靠，不缓存
+        if (
+            result.get("type") == "tv"
+            and episode is not None
+            and result.get("episode") != episode
+        ):
+            return
+
+        self._remember(cache_key, result)
+        if self.cache_db:
+            self.cache_db.set_cache(cache_key, result)
+
+    def _remember(self, cache_key: str, result: Dict[str, Any]):
+        """写入进程内缓存"""
+        with self._memory_cache_lock:
+            self._memory_cache[cache_key] = result
+            self._memory_cache.move_to_end(cache_key)
+            if len(self._memory_cache) > self.MEMORY_CACHE_SIZE:
+                self._memory_cache.popitem(last=False)
+
     def _extract_with_client(
         self, filename: str, service_type: str
     ) -> Optional[Dict[str, Any]]:
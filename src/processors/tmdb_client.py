@@ -1,12 +1,33 @@
+import contextlib
 import logging
-from typing import Optional, Dict, Any, List
+import threading
+from typing import Optional, Dict, Any, List, Callable, Tuple, Union
+import requests
+from requests.adapters import HTTPAdapter
 import tmdbsimple as tmdb
 from ..core.database import TMDBCacheDB
+from ..utils.error_handlers import RateLimiter
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """
+    去掉请求头中的 Connection: close
+    tmdbsimple 的默认请求头带有该项，服务端会在每次响应后断开，共享会话无法复用连接
+    """
+
+    def add_headers(self, request, **kwargs):
+        request.headers.pop("Connection", None)
 
 
 class TMDBClient:
     """TMDB客户端 - 修复缓存中的动漫判断"""
 
+    # TMDB 限制约 40 次/10 秒，留出余量
+    RATE_LIMIT_REQUESTS = 35
+    RATE_LIMIT_PERIOD = 10
+    # TMDB 单IP最大并发连接数
+    MAX_CONCURRENT_REQUESTS = 20
+
     def __init__(self, api_key: str, cache_db: TMDBCacheDB, proxy: str = ""):
         self.api_key = api_key
         self.cache_db = cache_db
@@ -17,22 +38,62 @@ class TMDBClient:
         tmdb.REQUESTS_TIMEOUT = 10
         self.language = "zh-CN"
 
+        # 多线程共享的请求限流
+        self._rate_limiter = RateLimiter(
+            self.RATE_LIMIT_REQUESTS, self.RATE_LIMIT_PERIOD
+        )
+        self._request_semaphore = threading.BoundedSemaphore(
+            self.MAX_CONCURRENT_REQUESTS
+        )
+
+        # 正在查询中的标题 -> [锁, 持有和等待该锁的线程数]，同一标题的并发查询只请求一次
+        self._lookup_locks: Dict[tuple, list] = {}
+        self._lookup_locks_lock = threading.Lock()
+
+        # 共享会话复用 TCP/TLS 连接，每个请求不再重新握手
+        session = requests.Session()
+        adapter = _KeepAliveAdapter(
+            pool_connections=1, pool_maxsize=self.MAX_CONCURRENT_REQUESTS
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
         # 设置代理
         if proxy:
-            import requests
-
-            session = requests.Session()
             session.proxies = {"http": proxy, "https": proxy}
-            tmdb.REQUESTS_SESSION = session
+        tmdb.REQUESTS_SESSION = session
 
         self._test_connection()
         self.logger.info("TMDB客户端初始化完成")
 
+    def _request(self, func: Callable, *args, **kwargs) -> Any:
+        """限流后发起TMDB请求"""
+        with self._request_semaphore:
+            self._rate_limiter.acquire()
+            return func(*args, **kwargs)
+
+    @contextlib.contextmanager
+    def _lookup_lock(self, key: tuple):
+        """按查询键加锁，同一剧集的多个文件同时处理时只有一个线程访问TMDB"""
+        with self._lookup_locks_lock:
+            entry = self._lookup_locks.get(key)
+            if entry is None:
+                entry = self._lookup_locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            # 最后一个持有或等待的线程退出后才移除，之后到达的线程不会拿到新锁并发查询
+            with self._lookup_locks_lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._lookup_locks[key]
+
     def _test_connection(self):
         """测试连接"""
         try:
             config = tmdb.Configuration()
-            response = config.info()
+            response = self._request(config.info)
             if "images" in response:
                 self.logger.info("TMDB连接测试成功")
             else:
@@ -43,23 +104,41 @@ class TMDBClient:
                 raise Exception("TMDB认证失败：请检查API密钥")
             raise
 
+    def _get_cached(
+        self, query_type: str, title: str, year: Optional[int]
+    ) -> Optional[Dict[str, Any]]:
+        """查询缓存 - 缓存中已经包含完整的动漫判断信息"""
+        cached = self.cache_db.get_cache(query_type, title, year)
+        if cached:
+            self.logger.debug(f"使用缓存: {title}, 动漫: {cached['is_anime']}")
+        return cached
+
     def search_movie(
         self, title: str, year: Optional[int] = None
     ) -> Optional[Dict[str, Any]]:
         """搜索电影"""
-        # 检查缓存 - 现在缓存中已经包含完整的动漫判断信息
-        cached = self.cache_db.get_cache("movie", title, year)
+        cached = self._get_cached("movie", title, year)
         if cached:
-            self.logger.debug(f"使用缓存: {title}, 动漫: {cached['is_anime']}")
             return cached
 
+        with self._lookup_lock(("movie", title, year)):
+            # 等待期间其他线程可能已完成同一查询
+            cached = self._get_cached("movie", title, year)
+            if cached:
+                return cached
+            return self._search_movie(title, year)
+
+    def _search_movie(
+        self, title: str, year: Optional[int]
+    ) -> Optional[Dict[str, Any]]:
+        """搜索电影（未命中缓存时请求TMDB）"""
         try:
             search = tmdb.Search()
             params = {"query": title}
             if year:
                 params["primary_release_year"] = year
 
-            response = search.movie(**params)
+            response = self._request(search.movie, **params)
 
             if search.results:
                 return self._process_movie_result(search.results[0], title, year)
@@ -73,15 +152,22 @@ class TMDBClient:
 
     def search_tv(self, title: str) -> Optional[Dict[str, Any]]:
         """搜索电视剧"""
-        # 检查缓存 - 现在缓存中已经包含完整的动漫判断信息
-        cached = self.cache_db.get_cache("tv", title, None)
+        cached = self._get_cached("tv", title, None)
         if cached:
-            self.logger.debug(f"使用缓存: {title}, 动漫: {cached['is_anime']}")
             return cached
 
+        with self._lookup_lock(("tv", title, None)):
+            # 等待期间其他线程可能已完成同一查询
+            cached = self._get_cached("tv", title, None)
+            if cached:
+                return cached
+            return self._search_tv(title)
+
+    def _search_tv(self, title: str) -> Optional[Dict[str, Any]]:
+        """搜索电视剧（未命中缓存时请求TMDB）"""
         try:
             search = tmdb.Search()
-            response = search.tv(query=title)
+            response = self._request(search.tv, query=title)
 
             if search.results:
                 return self._process_tv_result(search.results[0], title)
@@ -194,7 +280,7 @@ class TMDBClient:
         """获取电影详情"""
         try:
             movie = tmdb.Movies(movie_id)
-            return movie.info(language=self.language)
+            return self._request(movie.info, language=self.language)
         except Exception as e:
             self.logger.error(f"获取电影详情失败 {movie_id}: {e}")
             return None
@@ -203,7 +289,7 @@ class TMDBClient:
         """获取电视剧详情"""
         try:
             tv = tmdb.TV(tv_id)
-            return tv.info(language=self.language)
+            return self._request(tv.info, language=self.language)
         except Exception as e:
             self.logger.error(f"获取电视剧详情失败 {tv_id}: {e}")
             return None
@@ -229,11 +315,20 @@ class TMDBClient:
 
         return name_match
 
-    def get_configuration(self) -> Optional[Dict[str, Any]]:
-        """获取配置信息"""
+    def get_configuration(
+        self, timeout: Optional[Union[float, Tuple[float, float]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        获取配置信息
+
+        Args:
+            timeout: 本次请求的超时时间（连接, 读取），默认使用 REQUESTS_TIMEOUT
+        """
         try:
             config = tmdb.Configuration()
-            return config.info()
+            if timeout is not None:
+                config.timeout = timeout
+            return self._request(config.info)
         except Exception as e:
             self.logger.error(f"获取TMDB配置失败: {e}")
             return None
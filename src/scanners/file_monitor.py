@@ -1,6 +1,6 @@
 import logging
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Optional
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from ..utils.helpers import is_video_file
@@ -9,9 +9,16 @@ from ..utils.helpers import is_video_file
 class MediaFileHandler(FileSystemEventHandler):
     """媒体文件事件处理器"""
 
-    def __init__(self, config, callback: Callable[[Path], None]):
+    def __init__(
+        self,
+        config,
+        callback: Callable[[Path], None],
+        close_callback: Optional[Callable[[Path], None]] = None,
+    ):
         self.config = config
         self.callback = callback
+        # 写入方关闭文件时的回调（仅 inotify 支持该事件）
+        self.close_callback = close_callback
         self.logger = logging.getLogger(__name__)
 
     def on_created(self, event):
@@ -24,6 +31,13 @@ class MediaFileHandler(FileSystemEventHandler):
         if not event.is_directory:
             self._process_file(Path(event.dest_path))
 
+    def on_closed(self, event):
+        """处理文件写入后关闭事件"""
+        if not event.is_directory and self.close_callback:
+            file_path = Path(event.src_path)
+            if is_video_file(file_path):
+                self.close_callback(file_path)
+
     def _process_file(self, file_path: Path):
         """处理文件"""
         if is_video_file(file_path):
@@ -36,11 +50,16 @@ class MediaFileHandler(FileSystemEventHandler):
 class FileMonitor:
     """文件监控器"""
 
-    def __init__(self, config, callback: Callable[[Path], None]):
+    def __init__(
+        self,
+        config,
+        callback: Callable[[Path], None],
+        close_callback: Optional[Callable[[Path], None]] = None,
+    ):
         self.config = config
         self.callback = callback
         self.observer = Observer()
-        self.handler = MediaFileHandler(config, callback)
+        self.handler = MediaFileHandler(config, callback, close_callback)
         self.logger = logging.getLogger(__name__)
 
     def start(self):
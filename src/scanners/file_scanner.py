@@ -1,7 +1,9 @@
 # src/scanners/file_scanner.py (修改版本)
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
-from typing import Iterator, Tuple, List
+from typing import Iterator, Tuple, List, Optional, Sequence
 from ..utils.helpers import is_video_file, format_file_size
 
 
@@ -25,31 +27,26 @@ class FileScanner:
 
         stats = {"total": 0, "video": 0, "skipped": 0, "found": 0}
 
+        # 基于 os.scandir 逐层遍历，复用 DirEntry 缓存的类型和大小信息
+        pending_directories = [directory]
         try:
-            for file_path in directory.rglob("*"):
-                if not file_path.is_file():
-                    continue
-
-                stats["total"] += 1
-
-                should_skip, skip_reason = self._should_skip_file(file_path, check_size)
-                if should_skip:
-                    stats["skipped"] += 1
-                    self.logger.debug(f"跳过文件: {file_path} - {skip_reason}")
-                    continue
-
-                stats["video"] += 1
-                stats["found"] += 1
-
-                try:
-                    file_size = file_path.stat().st_size
+            while pending_directories:
+                files, subdirectories, skipped = self._scan_single_directory(
+                    pending_directories.pop(), check_size
+                )
+                pending_directories.extend(subdirectories)
+
+                stats["total"] += len(files) + skipped
+                stats["skipped"] += skipped
+
+                for file_path, stat_result in files:
+                    stats["video"] += 1
+                    stats["found"] += 1
+                    file_size = stat_result.st_size
                     self.logger.debug(
                         f"找到文件: {file_path} ({format_file_size(file_size)})"
                     )
                     yield file_path, file_size
-                except (OSError, PermissionError) as e:
-                    stats["skipped"] += 1
-                    self.logger.warning(f"无法访问文件: {file_path} - {e}")
 
         except Exception as e:
             self.logger.error(f"扫描目录时发生错误 {directory}: {e}")
@@ -63,7 +60,7 @@ class FileScanner:
         )
 
     def quick_scan_directories(
-        self, directories: List[Path], check_size: bool = True
+        self, directories: Sequence[Path], check_size: bool = True
     ) -> Iterator[Tuple[Path, int]]:
         """快速扫描多个目录"""
         self.logger.info(f"开始快速扫描 {len(directories)} 个目录")
@@ -84,25 +81,97 @@ class FileScanner:
 
         self.logger.info(f"快速扫描完成，共处理 {total_files} 个文件")
 
-    def _should_skip_file(self, file_path: Path, check_size: bool) -> Tuple[bool, str]:
+    def collect_paths(
+        self, directory: Path, check_size: bool = True, max_workers: int = 4
+    ) -> List[Tuple[Path, os.stat_result]]:
+        """并行遍历目录，一次性收集所有待处理文件及其stat信息（每个子目录一个任务）"""
+        if not directory.exists():
+            self.logger.warning(f"目录不存在: {directory}")
+            return []
+
+        self.logger.info(f"开始收集目录文件: {directory}")
+
+        found_files: List[Tuple[Path, os.stat_result]] = []
+        skipped = 0
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="Scanner"
+        ) as executor:
+            pending = {
+                executor.submit(self._scan_single_directory, directory, check_size)
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, subdirectories, skipped_count = future.result()
+                    found_files.extend(files)
+                    skipped += skipped_count
+                    for subdirectory in subdirectories:
+                        pending.add(
+                            executor.submit(
+                                self._scan_single_directory, subdirectory, check_size
+                            )
+                        )
+
+        self.logger.info(
+            f"收集完成: {directory} - 找到: {len(found_files)}, 跳过: {skipped}"
+        )
+        return found_files
+
+    def _scan_single_directory(
+        self, directory: Path, check_size: bool
+    ) -> Tuple[List[Tuple[Path, os.stat_result]], List[Path], int]:
+        """扫描单层目录，返回（文件列表, 子目录列表, 跳过数量）"""
+        files: List[Tuple[Path, os.stat_result]] = []
+        subdirectories: List[Path] = []
+        skipped = 0
+
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirectories.append(Path(entry.path))
+                            continue
+                        if not entry.is_file():
+                            continue
+
+                        file_path = Path(entry.path)
+                        should_skip, skip_reason = self._should_skip_file(
+                            file_path, check_size, entry
+                        )
+                        if should_skip:
+                            skipped += 1
+                            self.logger.debug(f"跳过文件: {file_path} - {skip_reason}")
+                            continue
+
+                        # DirEntry 会缓存 stat 结果，后续处理无需再次 stat
+                        files.append((file_path, entry.stat()))
+                    except (OSError, PermissionError) as e:
+                        skipped += 1
+                        self.logger.warning(f"无法访问文件: {entry.path} - {e}")
+        except (OSError, PermissionError) as e:
+            self.logger.error(f"扫描目录时发生错误 {directory}: {e}")
+
+        return files, subdirectories, skipped
+
+    def _should_skip_file(
+        self, file_path: Path, check_size: bool, entry: Optional[os.DirEntry] = None
+    ) -> Tuple[bool, str]:
         """检查是否应该跳过文件 - 调整检查顺序"""
         # 1. 首先检查是否是视频文件
         if not is_video_file(file_path):
             return True, "不是视频文件"
 
         # 2. 检查忽略模式
-        filename = file_path.name.lower()
-        for pattern in self.config.ignore_patterns:
-            if pattern.startswith("*") and filename.endswith(pattern[1:]):
-                return True, f"匹配忽略模式: {pattern}"
-            elif pattern == filename:
-                return True, f"匹配忽略模式: {pattern}"
+        if self.config.ignore_patterns_re.match(file_path.name):
+            return True, "匹配忽略模式"
 
         # 3. 文件大小检查（可选）- 注意：这里不进行稳定性检查
         # 稳定性检查将在后续流程中进行
         if check_size:
             try:
-                file_size = file_path.stat().st_size
+                file_size = (entry or file_path).stat().st_size
                 if file_size < self.config.ignore_file_size:
                     formatted_size = format_file_size(file_size)
                     return True, f"文件太小: {formatted_size}"
@@ -143,6 +143,37 @@ def retry_with_backoff(
     return decorator
 
 
+class RateLimiter:
+    """令牌桶限流器（线程安全）"""
+
+    def __init__(self, max_rate: int, time_period: float):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._fill_rate = max_rate / time_period
+        self._tokens = float(max_rate)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """获取一个令牌，令牌不足时阻塞等待"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.max_rate,
+                    self._tokens + (now - self._last_refill) * self._fill_rate,
+                )
+                self._last_refill = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait_time = (1 - self._tokens) / self._fill_rate
+
+            time.sleep(wait_time)
+
+
 class ResourceManager:
     """资源管理器"""
 
@@ -1,37 +1,44 @@
 import hashlib
 import logging
+import os
 import time
 from pathlib import Path
 from typing import Optional, Callable
 from functools import wraps
 
-# 视频文件扩展名
-VIDEO_EXTENSIONS = {
-    ".mp4",
-    ".mkv",
-    ".avi",
-    ".mov",
-    ".wmv",
-    ".flv",
-    ".webm",
-    ".m4v",
-    ".mpg",
-    ".mpeg",
-    ".rm",
-    ".rmvb",
-    ".ts",
-    ".m2ts",
-    ".3gp",
-    ".asf",
-    ".f4v",
-    ".m2t",
-    ".m2ts",
-    ".mts",
-    ".ogv",
-    ".qt",
-    ".vob",
-    ".dat",
-}
+try:
+    import blake3
+except ImportError:  # 未安装blake3时回退到标准库的blake2b
+    blake3 = None
+
+# 视频文件扩展名（小写，frozenset 保证 O(1) 查找且不可变）
+VIDEO_EXTENSIONS = frozenset(
+    {
+        ".mp4",
+        ".mkv",
+        ".avi",
+        ".mov",
+        ".wmv",
+        ".flv",
+        ".webm",
+        ".m4v",
+        ".mpg",
+        ".mpeg",
+        ".rm",
+        ".rmvb",
+        ".ts",
+        ".m2ts",
+        ".3gp",
+        ".asf",
+        ".f4v",
+        ".m2t",
+        ".mts",
+        ".ogv",
+        ".qt",
+        ".vob",
+        ".dat",
+    }
+)
 
 
 def setup_logging(level: str = "INFO") -> None:
@@ -73,8 +80,85 @@ def setup_logging(level: str = "INFO") -> None:
     logging.basicConfig(level=log_level, handlers=handlers)
 
 
-def calculate_md5(file_path: Path, max_retries: int = 3) -> Optional[str]:
-    """计算文件的MD5值"""
+# 计算哈希时每次读取的块大小（1MB）
+DEFAULT_HASH_CHUNK_SIZE = 1024 * 1024
+
+# 文件指纹算法（仅用于去重，不要求密码学安全）
+FINGERPRINT_ALGORITHM = "blake3" if blake3 is not None else "blake2b"
+
+# 快速指纹读取的头部/尾部区域大小（4MB）
+QUICK_HASH_REGION_SIZE = 4 * 1024 * 1024
+
+# 超过该大小的文件使用多线程计算指纹（1GB）
+DEFAULT_PARALLEL_HASH_THRESHOLD = 1024 * 1024 * 1024
+
+
+# 可用于比对旧记录的指纹算法（blake3 由第三方库提供，单独处理）
+_HASH_FACTORIES = {
+    "blake2b": lambda: hashlib.blake2b(digest_size=16),
+    "md5": hashlib.md5,
+}
+
+
+def _hash_file(
+    file_path: Path,
+    chunk_size: int,
+    parallel_threshold: int = DEFAULT_PARALLEL_HASH_THRESHOLD,
+    algorithm: str = FINGERPRINT_ALGORITHM,
+) -> str:
+    """按指定指纹算法计算文件哈希，默认使用当前指纹算法"""
+    if algorithm == "blake3":
+        if blake3 is None:
+            raise ValueError("未安装blake3，无法计算blake3指纹")
+        # BLAKE3内部使用SIMD处理内存映射的文件，大文件按树结构分发到多个线程
+        max_threads = 1
+        if file_path.stat().st_size >= parallel_threshold:
+            max_threads = blake3.blake3.AUTO
+        hasher = blake3.blake3(max_threads=max_threads)
+        hasher.update_mmap(str(file_path))
+        return hasher.hexdigest()
+
+    factory = _HASH_FACTORIES.get(algorithm)
+    if factory is None:
+        raise ValueError(f"不支持的指纹算法: {algorithm}")
+
+    with open(file_path, "rb", buffering=0) as f:
+        # 提示内核按顺序读取，加大预读窗口
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+
+        # Python 3.11+ 由C实现的循环读取，不产生Python层的块对象
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, factory).hexdigest()
+
+        # 旧版本复用同一缓冲区读取，避免每块重新分配bytes
+        hasher = factory()
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            hasher.update(view[:size])
+        return hasher.hexdigest()
+
+
+def calculate_fingerprint(
+    file_path: Path,
+    max_retries: int = 3,
+    chunk_size: int = DEFAULT_HASH_CHUNK_SIZE,
+    parallel_threshold: int = DEFAULT_PARALLEL_HASH_THRESHOLD,
+    algorithm: str = FINGERPRINT_ALGORITHM,
+) -> Optional[str]:
+    """
+    计算文件内容指纹
+
+    Args:
+        algorithm: 指纹算法，默认为 FINGERPRINT_ALGORITHM；比对旧记录时传入记录中的算法
+    """
     logger = logging.getLogger(__name__)
 
     for attempt in range(max_retries):
@@ -84,35 +168,51 @@ def calculate_md5(file_path: Path, max_retries: int = 3) -> Optional[str]:
                 logger.debug(f"文件大小为0: {file_path}")
                 return None
 
-            hash_md5 = hashlib.md5()
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
-
-            md5_result = hash_md5.hexdigest()
-            logger.debug(f"MD5计算成功: {file_path}")
-            return md5_result
+            fingerprint = _hash_file(
+                file_path, chunk_size, parallel_threshold, algorithm
+            )
+            logger.debug(f"文件指纹计算成功: {file_path}")
+            return fingerprint
 
         except (FileNotFoundError, PermissionError, OSError) as e:
             if attempt < max_retries - 1:
                 logger.warning(
-                    f"MD5计算失败，重试 {attempt + 1}/{max_retries}: {file_path}"
+                    f"文件指纹计算失败，重试 {attempt + 1}/{max_retries}: {file_path}"
                 )
                 time.sleep(2)
             else:
-                logger.error(f"MD5计算最终失败 {file_path}: {e}")
+                logger.error(f"文件指纹计算最终失败 {file_path}: {e}")
                 return None
         except Exception as e:
-            logger.error(f"计算MD5失败 {file_path}: {e}")
+            logger.error(f"计算文件指纹失败 {file_path}: {e}")
             return None
 
     return None
 
 
+def calculate_quick_hash(
+    file_path: Path, region_size: int = QUICK_HASH_REGION_SIZE
+) -> Optional[str]:
+    """计算快速指纹：文件大小 + 头部和尾部各 region_size 字节"""
+    try:
+        with open(file_path, "rb", buffering=0) as f:
+            file_size = os.fstat(f.fileno()).st_size
+            hasher = hashlib.blake2b(digest_size=16)
+            hasher.update(file_size.to_bytes(8, "little"))
+            hasher.update(f.read(region_size))
+            if file_size > region_size:
+                f.seek(max(region_size, file_size - region_size))
+                hasher.update(f.read(region_size))
+            return hasher.hexdigest()
+    except OSError as e:
+        logging.getLogger(__name__).warning(f"计算快速指纹失败 {file_path}: {e}")
+        return None
+
+
 def is_video_file(file_path: Path) -> bool:
     """检查是否是视频文件"""
     is_video = file_path.suffix.lower() in VIDEO_EXTENSIONS
-    if not is_video:
+    if not is_video and logging.getLogger().isEnabledFor(logging.DEBUG):
         logging.debug(f"不是视频文件: {file_path}")
     return is_video
 
@@ -10,6 +10,13 @@ class SensitiveDataFilter(logging.Filter):
 
     SENSITIVE_KEYS = ["key", "password", "token", "secret", "api_key", "auth"]
 
+    # 预编译的敏感信息模式，每条日志都会用到
+    SENSITIVE_PATTERNS = [
+        (re.compile(r"api[_-]?key=([^\s&]+)", re.IGNORECASE), "api_key=***"),
+        (re.compile(r"password=([^\s&]+)", re.IGNORECASE), "password=***"),
+        (re.compile(r"token=([^\s&]+)", re.IGNORECASE), "token=***"),
+    ]
+
     def filter(self, record: logging.LogRecord) -> bool:
         """过滤敏感信息"""
         if hasattr(record, "msg") and record.msg:
@@ -23,14 +30,13 @@ class SensitiveDataFilter(logging.Filter):
 
     def _sanitize_message(self, message: str) -> str:
         """清理消息中的敏感信息"""
+        # 所有模式都包含"="，大多数日志可以直接跳过
+        if "=" not in message:
+            return message
+
         # 替换API密钥模式
-        message = re.sub(
-            r"api[_-]?key=([^\s&]+)", "api_key=***", message, flags=re.IGNORECASE
-        )
-        message = re.sub(
-            r"password=([^\s&]+)", "password=***", message, flags=re.IGNORECASE
-        )
-        message = re.sub(r"token=([^\s&]+)", "token=***", message, flags=re.IGNORECASE)
+        for pattern, replacement in self.SENSITIVE_PATTERNS:
+            message = pattern.sub(replacement, message)
 
         return message
 
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.core.database import ProcessedFilesDB
+from src.utils.helpers import calculate_fingerprint, calculate_quick_hash
+
+# 测试文件很小，缩小快速指纹的首尾区域，使中间内容不参与快速指纹
+REGION_SIZE = 16
+
+
+class FindDuplicateTest(unittest.TestCase):
+    """按快速指纹和完整指纹查找相同内容的已处理文件"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp_dir = Path(self._tmp.name)
+        self.db = ProcessedFilesDB(str(self.tmp_dir / "processed.db"))
+
+    def tearDown(self):
+        self.db.close()
+        self._tmp.cleanup()
+
+    def _write(self, name: str, content: bytes) -> str:
+        path = self.tmp_dir / name
+        path.write_bytes(content)
+        return str(path)
+
+    def _record(self, file_path: str) -> str:
+        """按首次处理的方式记录文件：只保存快速指纹"""
+        stat_result = os.stat(file_path)
+        quick_hash = calculate_quick_hash(Path(file_path), REGION_SIZE)
+        self.db.add_processed_file(
+            file_path,
+            stat_result.st_size,
+            mtime_ns=stat_result.st_mtime_ns,
+            quick_hash=quick_hash,
+            file_dev=stat_result.st_dev,
+            file_ino=stat_result.st_ino,
+        )
+        return quick_hash
+
+    @staticmethod
+    def _fingerprint_of(file_path: str, algorithm: str):
+        return calculate_fingerprint(Path(file_path), algorithm=algorithm)
+
+    def _find(self, file_path: str):
+        return self.db.find_duplicate(
+            file_path,
+            os.stat(file_path).st_size,
+            calculate_quick_hash(Path(file_path), REGION_SIZE),
+            self._fingerprint_of,
+        )
+
+    def test_identical_copy_at_another_path(self):
+        content = b"head" * 8 + os.urandom(256) + b"tail" * 8
+        original = self._write("original.mkv", content)
+        copy = self._write("copy.mkv", content)
+        self._record(original)
+
+        duplicate, fingerprint = self._find(copy)
+
+        self.assertEqual(duplicate, original)
+        self.assertIsNotNone(fingerprint)
+        # 已处理文件的完整指纹被补存，之后可直接按指纹匹配
+        self.assertEqual(self.db.find_fingerprint(len(content), fingerprint), original)
+
+    def test_same_head_and_tail_with_different_middle(self):
+        head, tail = b"head" * 8, b"tail" * 8
+        original = self._write("original.mkv", head + b"a" * 256 + tail)
+        other = self._write("other.mkv", head + b"b" * 256 + tail)
+        self._record(original)
+
+        duplicate, fingerprint = self._find(other)
+
+        self.assertIsNone(duplicate)
+        # 快速指纹相同，已计算完整指纹供新记录保存
+        self.assertIsNotNone(fingerprint)
+
+    def test_no_quick_hash_match_skips_full_hash(self):
+        original = self._write("original.mkv", b"x" * 512)
+        other = self._write("other.mkv", b"y" * 512)
+        self._record(original)
+
+        self.assertEqual(self._find(other), (None, None))
+
+
+if __name__ == "__main__":
+    unittest.main()